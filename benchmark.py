@@ -0,0 +1,387 @@
+#!/usr/bin/env python
+#author: Hadi Cahyadi
+#email: cumulus13@gmail.com
+#license: MIT
+
+"""
+Benchmarks for PYTHONSTARTUP.py.
+
+Measures interpreter startup with and without the script (plain Python
+and IPython, with the optional rich/pyread packages present or blocked)
+and the hot path of every helper, then writes the results as JSON.
+
+Usage:
+    python benchmark.py run -o bench.json
+    python benchmark.py run --quick --only helpers
+    python benchmark.py compare baseline.json bench.json --threshold 0.10
+"""
+
+import argparse
+import contextlib
+import fnmatch
+import hashlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SCRIPT = os.path.join(HERE, 'PYTHONSTARTUP.py')
+HELPERS = os.path.join(HERE, 'pythonstartup_helpers.py')
+
+OPTIONAL_PACKAGES = ['rich', 'pyread', 'richcolorlog', 'pyarrow', 'IPython']
+# Blocked for the "no optional packages" startup variants
+BLOCKED_PACKAGES = ['rich', 'pyread', 'richcolorlog', 'pyarrow', 'pygments', 'make_colors', 'pathlib3', 'cmdw']
+
+MODULE_SIZES = {'small': 50, 'medium': 2000, 'huge': 20000}  # functions per module
+
+BLOCKER = '''
+import sys
+class _Blocker:
+    names = {blocked!r}
+    def find_spec(self, name, path=None, target=None):
+        if name.split('.')[0] in self.names:
+            raise ImportError(f"{{name}} blocked by benchmark")
+        return None
+sys.meta_path.insert(0, _Blocker())
+del _Blocker
+exec(compile(open({script!r}).read(), {script!r}, 'exec'), {{'__name__': '__main__', '__file__': {script!r}}})
+'''
+
+
+def _available(name):
+    import importlib.util
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def metadata():
+    """Environment metadata stored alongside the results."""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=HERE, capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+
+    digest = hashlib.sha256()
+    for path in (SCRIPT, HELPERS):
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': sys.version.split()[0],
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'git_commit': commit,
+        'script_sha256': digest.hexdigest(),
+        'optional_packages': {name: _available(name) for name in OPTIONAL_PACKAGES},
+    }
+
+
+def summarize(samples):
+    return {
+        'median': statistics.median(samples),
+        'min': min(samples),
+        'max': max(samples),
+        'runs': len(samples),
+        'unit': 's',
+    }
+
+
+# ============================================================
+# Startup
+# ============================================================
+
+def _time_process(cmd, env, runs):
+    samples = []
+    # One untimed run first, so every variant is measured with warm caches
+    subprocess.run(cmd, env=env, stdin=subprocess.DEVNULL,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    for _ in range(runs):
+        start = time.perf_counter()
+        # No timeout: with one, Popen.wait() polls in 50 ms steps and
+        # quantizes the measurement.
+        subprocess.run(cmd, env=env, stdin=subprocess.DEVNULL,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def bench_startup(runs, workdir):
+    import py_compile
+
+    results = {}
+    # The helpers are imported from their __pycache__ entry; write it even
+    # under PYTHONDONTWRITEBYTECODE so the timings reflect a normal setup.
+    py_compile.compile(HELPERS, doraise=True)
+    env = dict(os.environ)
+    for var in ('PYTHONSTARTUP', 'LOGGER_SETUP', 'RICH_AVAILABLE', 'PYREAD_AVAILABLE'):
+        env.pop(var, None)
+
+    blocker = os.path.join(workdir, 'startup_blocked.py')
+    with open(blocker, 'w') as f:
+        f.write(BLOCKER.format(blocked=BLOCKED_PACKAGES, script=SCRIPT))
+
+    # name: (startup file, startup profile)
+    variants = {
+        'baseline': (None, None),
+        'script': (SCRIPT, None),
+        'script_no_optional': (blocker, None),
+        'script_minimal': (SCRIPT, 'minimal'),
+    }
+
+    def variant_env(profile):
+        run_env = dict(env)
+        run_env.pop('PYTHONSTARTUP_PROFILE', None)
+        if profile:
+            run_env['PYTHONSTARTUP_PROFILE'] = profile
+        return run_env
+
+    # `python -i` with stdin at EOF runs PYTHONSTARTUP, then exits
+    python = [sys.executable, '-q', '-i']
+    for name, (startup, profile) in variants.items():
+        run_env = variant_env(profile)
+        if startup:
+            run_env['PYTHONSTARTUP'] = startup
+        results[f'startup.python.{name}'] = _time_process(python, run_env, runs)
+
+    ipython = shutil.which('ipython')
+    if ipython:
+        base = [ipython, '--no-banner', '--HistoryManager.hist_file=:memory:', '-c', 'pass']
+        for name, (startup, profile) in variants.items():
+            cmd = list(base)
+            if startup:
+                cmd.insert(1, f"--InteractiveShellApp.exec_files=['{startup}']")
+            results[f'startup.ipython.{name}'] = _time_process(cmd, variant_env(profile), runs)
+
+    return results
+
+
+# ============================================================
+# Helpers (in-process)
+# ============================================================
+
+def load_script():
+    """
+    Execute PYTHONSTARTUP.py, silencing its output, and return the helper
+    module's namespace (patching it affects the helpers themselves).
+    """
+    namespace = {'__name__': 'pythonstartup_bench', '__file__': SCRIPT}
+    with contextlib.redirect_stdout(io.StringIO()):
+        exec(compile(open(SCRIPT).read(), SCRIPT, 'exec'), namespace)
+        return vars(namespace['load_helpers']())
+
+
+def _time_call(func, runs, setup=None):
+    samples = []
+    sink = io.StringIO()
+    for _ in range(runs):
+        if setup:
+            setup()
+        with contextlib.redirect_stdout(sink), contextlib.redirect_stderr(sink):
+            start = time.perf_counter()
+            func()
+            samples.append(time.perf_counter() - start)
+        sink.seek(0)
+        sink.truncate()
+    return summarize(samples)
+
+
+def _write_module(path, functions):
+    with open(path, 'w') as f:
+        f.write('"""Synthetic benchmark module."""\n\n')
+        for i in range(functions):
+            f.write(
+                f"def func_{i}(a, b=1):\n"
+                f"    \"\"\"Function {i}.\"\"\"\n"
+                f"    total = a + b * {i}\n"
+                f"    return [total for _ in range(3)]\n\n"
+            )
+
+
+def _import_path(name, path):
+    import importlib.util
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    sys.modules[name] = module
+    return module
+
+
+def bench_helpers(runs, workdir):
+    results = {}
+    ns = load_script()
+
+    # Output goes to a StringIO, which would take the plain-text fast path:
+    # time the terminal path (syntax highlighting) without the interactive
+    # pager, which then drains every chunk straight to stdout.
+    ns['_stdout_is_terminal'] = lambda: True
+    ns['_pager_interactive'] = lambda: False
+
+    for size, functions in MODULE_SIZES.items():
+        path = os.path.join(workdir, f'bench_{size}.py')
+        _write_module(path, functions)
+        module = _import_path(f'bench_{size}', path)
+        heavy = runs if size != 'huge' else max(1, runs // 5)
+        results[f'get_source.{size}'] = _time_call(
+            lambda m=module: ns['get_source'](m), heavy, setup=ns['_source_cache'].clear
+        )
+        results[f'read_file.{size}'] = _time_call(
+            lambda p=path: ns['read_file'](p), heavy, setup=ns['_source_cache'].clear
+        )
+
+    # read_module_or_file() resolution paths
+    small = os.path.join(workdir, 'bench_small.py')
+    _write_module(os.path.join(workdir, 'bench_local.py'), MODULE_SIZES['small'])
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        paths = {
+            'file_path': small,
+            'sys_modules': 'json',
+            'dotted_import': 'email.mime.text',  # evicted from sys.modules each run
+            'local_py': 'bench_local',
+            'not_found': 'no_such_module_xyz',
+        }
+        for name, target in paths.items():
+            results[f'read_module_or_file.{name}'] = _time_call(
+                lambda t=target: ns['read_module_or_file'](t), runs,
+                setup=(lambda t=target: sys.modules.pop(t, None)) if name == 'dotted_import' else None
+            )
+    finally:
+        os.chdir(cwd)
+
+    # Data and log helpers on a ~10 MB file
+    csv_path = os.path.join(workdir, 'bench.csv')
+    with open(csv_path, 'w') as f:
+        f.write('id,value,label,note\n')
+        for i in range(200000):
+            f.write(f'{i},{i * 0.5},label{i % 7},{"" if i % 5 else "n/a"}\n')
+    for mode in ('head', 'tail', 'schema'):
+        results[f'peek.{mode}'] = _time_call(lambda m=mode: ns['peek'](csv_path, 10, m), runs)
+    results['peek.sample'] = _time_call(lambda: ns['peek'](csv_path, 10, 'sample'), max(1, runs // 5))
+
+    log_path = os.path.join(workdir, 'bench.log')
+    with open(log_path, 'w') as f:
+        for i in range(200000):
+            f.write(f'[2026-01-01 00:00:00] {"INFO" if i % 3 else "ERROR"}      bench: message {i}\n')
+    results['tail.last_100'] = _time_call(lambda: ns['tail'](log_path, 100, color=True), runs)
+    results['tail.grep'] = _time_call(lambda: ns['tail'](log_path, 1000, grep='ERROR'), runs)
+
+    # Shell helpers
+    results['expand.all'] = _time_call(lambda: ns['expand'](), runs)
+    results['expand.one'] = _time_call(lambda: ns['expand']('PATH'), runs)
+    results['get_terminal_width'] = _time_call(lambda: ns['get_terminal_width'](), runs)
+    results['now'] = _time_call(lambda: ns['now'](), runs)
+    results['detect_environment'] = _time_call(lambda: ns['detect_environment'](), runs)
+
+    # Logger() setup, with its "already set up" guard cleared each run
+    results['Logger.setup'] = _time_call(
+        lambda: ns['Logger'](), runs, setup=lambda: os.environ.pop('LOGGER_SETUP', None)
+    )
+    return results
+
+
+# ============================================================
+# Commands
+# ============================================================
+
+def run(args):
+    runs = 3 if args.quick else args.runs
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='pythonstartup-bench-') as workdir:
+        if args.only in (None, 'startup'):
+            results.update(bench_startup(runs, workdir))
+        if args.only in (None, 'helpers'):
+            results.update(bench_helpers(runs, workdir))
+
+    report = {'metadata': metadata(), 'metrics': results}
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+        print(f"Results written to {args.output}")
+    else:
+        print(text)
+
+    width = max((len(name) for name in results), default=0)
+    for name, stats in sorted(results.items()):
+        print(f"{name.ljust(width)}  {stats['median'] * 1000:10.3f} ms  (min {stats['min'] * 1000:.3f})",
+              file=sys.stderr)
+    return 0
+
+
+def compare(args):
+    with open(args.baseline) as f:
+        baseline = json.load(f)['metrics']
+    with open(args.current) as f:
+        current = json.load(f)['metrics']
+
+    tracked = sorted(set(baseline) & set(current))
+    if args.metric:
+        tracked = [name for name in tracked if any(fnmatch.fnmatch(name, p) for p in args.metric)]
+    if not tracked:
+        print("No metrics in common")
+        return 2
+
+    regressions = []
+    width = max(len(name) for name in tracked)
+    for name in tracked:
+        old, new = baseline[name]['median'], current[name]['median']
+        change = (new - old) / old if old else 0.0
+        regressed = change > args.threshold and (new - old) > args.min_delta
+        if regressed:
+            regressions.append(name)
+        print(f"{name.ljust(width)}  {old * 1000:10.3f} -> {new * 1000:10.3f} ms  "
+              f"{change:+8.1%}{'  REGRESSION' if regressed else ''}")
+
+    for name in sorted(set(baseline) ^ set(current)):
+        print(f"{name.ljust(width)}  only in {'baseline' if name in baseline else 'current'}")
+
+    if regressions:
+        print(f"\n{len(regressions)} metric(s) regressed more than {args.threshold:.0%}")
+        return 1
+    print("\nNo regressions")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark PYTHONSTARTUP.py")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_run = sub.add_parser('run', help="run the benchmarks")
+    p_run.add_argument('-o', '--output', help="write JSON results to this file")
+    p_run.add_argument('-n', '--runs', type=int, default=10, help="runs per metric (default: 10)")
+    p_run.add_argument('--quick', action='store_true', help="3 runs per metric")
+    p_run.add_argument('--only', choices=['startup', 'helpers'], help="run one group only")
+    p_run.set_defaults(func=run)
+
+    p_cmp = sub.add_parser('compare', help="compare two result files")
+    p_cmp.add_argument('baseline')
+    p_cmp.add_argument('current')
+    p_cmp.add_argument('-t', '--threshold', type=float, default=0.10,
+                       help="relative slowdown that counts as a regression (default: 0.10)")
+    p_cmp.add_argument('--min-delta', type=float, default=0.0005,
+                       help="ignore slowdowns smaller than this many seconds (default: 0.0005)")
+    p_cmp.add_argument('-m', '--metric', action='append',
+                       help="only track metrics matching this glob (repeatable)")
+    p_cmp.set_defaults(func=compare)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
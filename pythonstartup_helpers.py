@@ -0,0 +1,3064 @@
+#!/usr/bin/env python
+#author: Hadi Cahyadi
+#email: cumulus13@gmail.com
+#license: MIT
+
+"""
+Shell helpers for PYTHONSTARTUP.py.
+
+Python compiles the PYTHONSTARTUP file from source on every launch and
+never caches it, so everything beyond profile selection lives here and is
+loaded from __pycache__. PYTHONSTARTUP.py imports this module only when
+the active profile needs it, then calls use_profile() and initialize().
+"""
+
+import sys
+import os
+
+from typing import Optional, Any
+import threading
+
+# Active startup profile, set by PYTHONSTARTUP.py through use_profile()
+PROFILE_NAME = 'default'
+PROFILE = {}
+CACHE_DIR = None
+
+def use_profile(name, settings, cache_dir):
+    """Adopt the startup profile (and cache directory) chosen by PYTHONSTARTUP.py."""
+    global PROFILE_NAME, PROFILE, CACHE_DIR
+    PROFILE_NAME, PROFILE, CACHE_DIR = name, settings, cache_dir
+
+def profile_enabled(feature):
+    """True when the active startup profile enables feature."""
+    return bool(PROFILE.get(feature))
+
+exceptions=['pika', 'urllib3', 'urllib2', 'urllib', 'asyncio']
+tprint = None  # type: ignore  
+os.environ.update({'PYTHONIOENCODING': 'UTF-8'})
+os.environ.pop('LOGGING', None)
+os.environ.pop('NO_LOGGING', None)
+
+# ============================================================
+# LEVEL DEFINITION (Syslog + Extra)
+# ============================================================
+
+CUSTOM_LOG_LEVELS = {
+    # Syslog RFC5424 severity (0 = highest severity)
+    # We map to the top of the Python logging range (10–60)
+    "EMERGENCY": 60,   # System unusable
+    "ALERT":     55,   # Immediate action required
+    "CRITICAL":  50,   # logging.CRITICAL
+    "ERROR":     40,   # logging.ERROR
+    "WARNING":   30,   # logging.WARNING
+    "NOTICE":    25,   # Normal but significant condition
+    "INFO":      20,   # logging.INFO
+    "DEBUG":     10,   # logging.DEBUG
+
+    # Custom level tambahan
+    "SUCCESS":   22,   # Operation successful
+    "FATAL":     65,   # Hard failure beyond CRITICAL
+}
+
+# ANSI SGR codes used by tail() to colorize level names
+LOG_LEVEL_COLORS = {
+    "EMERGENCY": "1;97;41",
+    "FATAL":     "1;97;45",
+    "ALERT":     "1;91",
+    "CRITICAL":  "1;31",
+    "ERROR":     "31",
+    "WARNING":   "33",
+    "NOTICE":    "36",
+    "SUCCESS":   "1;32",
+    "INFO":      "32",
+    "DEBUG":     "2",
+}
+
+logger = None
+
+def Logger(backend='auto'):
+
+    if str(os.getenv("LOGGER_SETUP", "0")).lower() in ("1", 'yes", "ok", "on'):
+        return True
+
+    try:
+        if backend == 'logging':
+            raise ImportError("richcolorlog skipped by startup profile")
+        from richcolorlog import setup_logging, print_exception as tprint  # type: ignore
+        # sys.excepthook = CTraceback()
+        logger = setup_logging(__name__, exceptions = exceptions, show_locals=False)
+        # print(f"os.getenv('LOGGING'): {os.getenv('LOGGING')}")
+        # print(f"os.getenv('NO_LOGGING'): {os.getenv('NO_LOGGING')}")
+
+        os.environ.update({"LOGGER_SETUP": "1"})
+        os.environ.update({"LOGGER_TYPE": "rcl"})
+        return logger
+
+    except:
+        """
+        Create a custom logging level:
+            EMERGENCY, ALERT, CRITICAL, ERROR,
+            WARNING, NOTICE, INFO, DEBUG,
+            SUCCESS, FATAL
+        With syslog format + additional SUCCESS and FATAL.
+        """
+
+        import logging
+
+        # ============================================================
+        # 1. LEVEL REGISTRATION TO LOGGING
+        # ============================================================
+
+        def register_custom_levels():
+            for level_name, level_value in CUSTOM_LOG_LEVELS.items():
+                # Register for Python logging
+                logging.addLevelName(level_value, level_name)
+
+                # Add method to logging.Logger
+                def log_for(level):
+                    def _log_method(self, message, *args, **kwargs):
+                        if self.isEnabledFor(level):
+                            self._log(level, message, args, **kwargs)
+                    return _log_method
+
+                # create method lowercase: logger.emergency(), logger.notice(), dll
+                setattr(logging.Logger, level_name.lower(), log_for(level_value))
+
+
+        register_custom_levels()
+
+        # ============================================================
+        # 2. FORMATTER DETAIL & PROFESSIONAL
+        # ============================================================
+
+        DEFAULT_FORMAT = (
+            "[%(asctime)s] "
+            "%(levelname)-10s "
+            "%(name)s: "
+            "%(message)s"
+        )
+
+        DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+        def get_default_handler():
+            handler = logging.StreamHandler()
+            formatter = logging.Formatter(DEFAULT_FORMAT, DATE_FORMAT)
+            handler.setFormatter(formatter)
+            return handler
+
+
+        # ============================================================
+        # 3. FUNCTION TO GET THE LOGGER THAT IS READY
+        # ============================================================
+
+        def get_logger(name="default", level=logging.DEBUG):
+            logger = logging.getLogger(name)
+            logger.setLevel(level)
+
+            if not logger.handlers: # Avoid adding multiple handlers
+                logger.addHandler(get_default_handler())
+
+            return logger
+
+        logger = get_logger(__name__)
+        for exc in exceptions:
+            logging.getLogger(exc).setLevel(logging.CRITICAL)
+
+        os.environ.update({"LOGGER_SETUP": "1"})
+        os.environ.update({"LOGGER_TYPE": "logging"})
+
+        return logger
+
+if tprint is None:
+    def tprint(*args, **kwargs):
+        # Accepts (and ignores) richcolorlog's print_exception arguments
+        import traceback
+        traceback.print_exc()
+        report_exception()
+
+def rich_setup():
+    # Check for optional dependencies
+
+    if not profile_enabled('rich'):
+        return False
+
+    if str(os.getenv("RICH_AVAILABLE", False)).lower() in ("0", 'true', 'ok', 'yes', 'on'):
+        return True
+
+    try:
+        from rich.console import Console
+        from rich.syntax import Syntax
+        from rich import traceback as rich_traceback
+        rich_traceback.install(show_locals=False, theme='fruity', width=os.get_terminal_size()[0])
+        # rich's hook doesn't chain to the one it replaced
+        if globals().get('_traceback_reporter') is not None:
+            _wrap_excepthook()
+        os.environ.update({"RICH_AVAILABLE": "1"})
+        _prefetch_note_use('module:rich.console', 'module:rich.syntax')
+        return True
+    except:
+        pass
+
+    return False
+
+def rich_available():
+    if not profile_enabled('rich'):
+        return False
+    return str(os.getenv('RICH_AVAILABLE', False)).lower() in ("1", 'true', '0', 'yes', 'ok')
+
+# print(f"os.getenv('LOGGING')    [2]: {os.getenv('LOGGING')}")
+# print(f"os.getenv('NO_LOGGING') [2]: {os.getenv('NO_LOGGING')}")
+
+
+def pyread_setup():
+    if not profile_enabled('pyread'):
+        return False
+
+    if str(os.getenv("PYREAD_AVAILABLE", False)).lower() in ("0", 'true', 'ok', 'yes', 'on'):
+        return True
+
+    try:
+        from pyread import CodeAnalyzer  # type: ignore
+        os.environ.update({"PYREAD_AVAILABLE": "1"})
+        _prefetch_note_use('module:pyread')
+        return True
+    except ImportError:
+        pass
+
+    return False
+
+def pyread_available():
+    if not profile_enabled('pyread'):
+        return False
+    return str(os.getenv('PYREAD_AVAILABLE', False)).lower() in ("1", 'true', '0', 'yes', 'ok')
+
+# print(f"os.getenv('LOGGING')    [3]: {os.getenv('LOGGING')}")
+# print(f"os.getenv('NO_LOGGING') [3]: {os.getenv('NO_LOGGING')}")
+
+# Traceback shipping to TRACEBACK_DEBUGGER_SERVER
+REPORT_MAX_FRAMES = 30      # innermost frames kept per traceback
+REPORT_MAX_LOCALS = 20      # locals kept per frame
+REPORT_MAX_REPR = 200       # max characters per repr()
+REPORT_BATCH_SIZE = 20      # distinct errors per batch
+REPORT_FLUSH_INTERVAL = 2.0 # seconds a batch may wait before shipping
+REPORT_QUEUE_SIZE = 256     # reports beyond this are dropped, never blocking
+REPORT_DEDUP_WINDOW = 60.0  # seconds a repeated error is sent as a count only
+
+def _parse_endpoint(value):
+    """Parse 'host:port', 'tcp://host:port' or 'port' into (host, port)."""
+    if not value:
+        return None
+    value = str(value).strip()
+    if '://' in value:
+        value = value.split('://', 1)[1]
+    value = value.rstrip('/')
+    host, _, port = value.rpartition(':')
+    try:
+        return (host.strip('[]') or '127.0.0.1', int(port))
+    except ValueError:
+        return None
+
+_report_repr = None
+
+def _truncate(text, limit=REPORT_MAX_REPR):
+    return text if len(text) <= limit else text[:limit - 3] + '...'
+
+def _safe_repr(value, limit=REPORT_MAX_REPR):
+    """repr() bounded in the work done, not just the output (runs on the prompt thread)."""
+    global _report_repr
+
+    if _report_repr is None:
+        import reprlib
+        from itertools import islice
+
+        class BoundedRepr(reprlib.Repr):
+            # reprlib sorts dicts and sets first, which is O(n log n) on the whole container
+            def repr_dict(self, x, level):
+                if not x:
+                    return '{}'
+                if level <= 0:
+                    return '{...}'
+                items = [f"{self.repr1(k, level - 1)}: {self.repr1(v, level - 1)}"
+                         for k, v in islice(x.items(), self.maxdict)]
+                return '{' + ', '.join(items) + (', ...' if len(x) > self.maxdict else '') + '}'
+
+            def repr_set(self, x, level):
+                if not x:
+                    return 'set()'
+                return self._repr_iterable(list(islice(x, self.maxset + 1)), level, '{', '}', self.maxset)
+
+        _report_repr = BoundedRepr()
+        _report_repr.maxlevel = 3
+        _report_repr.maxstring = _report_repr.maxlong = _report_repr.maxother = REPORT_MAX_REPR
+        items = max(1, REPORT_MAX_REPR // 20)
+        for attr in ('maxlist', 'maxtuple', 'maxset', 'maxfrozenset', 'maxdeque', 'maxarray', 'maxdict'):
+            setattr(_report_repr, attr, items)
+    try:
+        text = _report_repr.repr(value)
+    except Exception as e:
+        text = f"<repr failed: {type(e).__name__}>"
+    return _truncate(text, limit)
+
+def _safe_str(value):
+    try:
+        return str(value)
+    except Exception as e:
+        return f"<str failed: {type(e).__name__}>"
+
+def _serialize_exception(exc_type, exc_value, tb):
+    """Turn an exception into a size-bounded, JSON-serializable dict."""
+    import hashlib
+    import linecache
+    import socket
+    import time
+    import traceback
+
+    frames = []
+    for frame, lineno in traceback.walk_tb(tb):
+        code = frame.f_code
+        local_items = [(k, v) for k, v in frame.f_locals.items() if not k.startswith('__')]
+        frames.append({
+            'file': code.co_filename,
+            'line': lineno,
+            'function': code.co_name,
+            'code': linecache.getline(code.co_filename, lineno).strip()[:REPORT_MAX_REPR],
+            'locals': {k: _safe_repr(v) for k, v in local_items[:REPORT_MAX_LOCALS]},
+        })
+    frames = frames[-REPORT_MAX_FRAMES:]
+
+    name = f"{exc_type.__module__}.{exc_type.__qualname__}"
+    key = name + ''.join(f"|{f['file']}:{f['line']}:{f['function']}" for f in frames)
+    return {
+        'fingerprint': hashlib.sha1(key.encode('utf-8', 'replace')).hexdigest()[:16],
+        'type': name,
+        'message': _truncate(_safe_str(exc_value), REPORT_MAX_REPR * 5),
+        'frames': frames,
+        'time': time.time(),
+        'count': 1,
+        'host': socket.gethostname(),
+        'pid': os.getpid(),
+        'cwd': os.getcwd(),
+    }
+
+class TracebackReporter:
+    """
+    Ship exception reports in compressed batches from a background thread.
+
+    Each batch is a zlib-compressed JSON document sent over a persistent
+    TCP connection, framed with a 4-byte big-endian length. Errors with
+    the same fingerprint are merged into one entry with a count, and
+    repeats within REPORT_DEDUP_WINDOW are sent without frames.
+    report() never blocks: when the queue is full the report is dropped.
+    """
+
+    _STOP = object()
+
+    def __init__(self, address, batch_size=REPORT_BATCH_SIZE,
+                 flush_interval=REPORT_FLUSH_INTERVAL, queue_size=REPORT_QUEUE_SIZE):
+        import queue
+        import threading
+
+        self.address = address
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(queue_size)
+        self.sent = 0
+        self.dropped = 0
+        self._sock = None
+        self._failures = 0
+        self._retry_at = 0.0
+        self._recent = {}  # fingerprint -> time last shipped with frames
+        self._thread = threading.Thread(target=self._run, name='traceback-reporter', daemon=True)
+        self._thread.start()
+
+    def report(self, exc_type, exc_value, tb):
+        """Queue an exception for shipping."""
+        import queue
+
+        try:
+            self.queue.put_nowait(_serialize_exception(exc_type, exc_value, tb))
+        except queue.Full:
+            self.dropped += 1
+        except Exception:
+            self.dropped += 1
+
+    def close(self, timeout=2.0):
+        """Flush pending reports and stop the worker (waits at most timeout)."""
+        import queue
+
+        try:
+            self.queue.put(self._STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+        self._disconnect()
+
+    def _run(self):
+        import queue
+        import time
+
+        batch = {}
+        deadline = None
+        while True:
+            timeout = self.flush_interval if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            stop = item is self._STOP
+            if item is not None and not stop:
+                entry = batch.get(item['fingerprint'])
+                if entry is None:
+                    batch[item['fingerprint']] = item
+                else:
+                    entry['count'] += 1
+                    entry['time'] = item['time']
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+
+            due = deadline is not None and time.monotonic() >= deadline
+            if batch and (stop or due or len(batch) >= self.batch_size):
+                if self._ship(list(batch.values())) or len(batch) > self.batch_size * 4:
+                    batch = {}
+                    deadline = None
+                else:
+                    deadline = time.monotonic() + self.flush_interval
+            if stop:
+                return
+
+    def _ship(self, reports):
+        """Send one batch; returns False to keep it for a later retry."""
+        import json
+        import struct
+        import time
+        import zlib
+
+        now = time.time()
+        if time.monotonic() < self._retry_at:
+            return False
+
+        payload = []
+        for report in reports:
+            last = self._recent.get(report['fingerprint'])
+            if last is not None and now - last < REPORT_DEDUP_WINDOW:
+                report = {k: report[k] for k in ('fingerprint', 'type', 'message', 'time', 'count')}
+                report['repeat'] = True
+            payload.append(report)
+
+        data = zlib.compress(json.dumps({'reports': payload}, default=str).encode('utf-8'))
+        try:
+            if self._sock is None:
+                import socket
+                self._sock = socket.create_connection(self.address, timeout=5)
+            self._sock.sendall(struct.pack('>I', len(data)) + data)
+        except OSError:
+            self._disconnect()
+            self._failures += 1
+            self._retry_at = time.monotonic() + min(2 ** self._failures, 60)
+            return False
+
+        self._failures = 0
+        self.sent += len(payload)
+        for report in payload:
+            if not report.get('repeat'):
+                self._recent[report['fingerprint']] = now
+        if len(self._recent) > 1024:
+            for key in sorted(self._recent, key=self._recent.get)[:512]:
+                del self._recent[key]
+        return True
+
+    def _disconnect(self):
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
+
+_traceback_reporter = None
+
+def report_exception(exc_type=None, exc_value=None, tb=None):
+    """Queue an exception (default: the one being handled) for the traceback server."""
+    if _traceback_reporter is None:
+        return False
+    if exc_type is None:
+        exc_type, exc_value, tb = sys.exc_info()
+        if exc_type is None:
+            return False
+    _traceback_reporter.report(exc_type, exc_value, tb)
+    return True
+
+def _wrap_excepthook():
+    """Report through sys.excepthook, then call the hook it replaces.
+
+    Called again whenever another hook (rich's) is installed on top, so
+    whichever was installed last still reaches the other.
+    """
+    previous = sys.excepthook
+    if getattr(previous, 'reports_tracebacks', False):
+        return
+
+    def excepthook(exc_type, exc_value, tb):
+        report_exception(exc_type, exc_value, tb)
+        previous(exc_type, exc_value, tb)
+
+    excepthook.previous = previous  # type: ignore
+    excepthook.reports_tracebacks = True  # type: ignore
+    sys.excepthook = excepthook
+
+def install_traceback_reporter(endpoint=None, **options):
+    """
+    Install an exception reporter as sys.excepthook and IPython's custom
+    exception handler.
+
+    Args:
+        endpoint: 'host:port' of the traceback server, defaults to
+            TRACEBACK_DEBUGGER_SERVER
+        **options: batch_size, flush_interval, queue_size
+
+    Returns:
+        The TracebackReporter, or None if no endpoint is configured
+    """
+    global _traceback_reporter
+    import atexit
+
+    address = _parse_endpoint(endpoint or os.getenv('TRACEBACK_DEBUGGER_SERVER'))
+    if address is None:
+        print(f"Error: invalid traceback server endpoint '{endpoint or os.getenv('TRACEBACK_DEBUGGER_SERVER')}'")
+        return None
+
+    uninstall_traceback_reporter()
+    _traceback_reporter = TracebackReporter(address, **options)
+    atexit.unregister(uninstall_traceback_reporter)
+    atexit.register(uninstall_traceback_reporter)
+
+    _wrap_excepthook()
+
+    try:
+        from IPython import get_ipython
+        ip = get_ipython()
+        if ip is not None:
+            def ipython_handler(shell, etype, evalue, tb, tb_offset=None):
+                shell.showtraceback((etype, evalue, tb), tb_offset=tb_offset)
+                report_exception(etype, evalue, tb)
+
+            ip.set_custom_exc((Exception,), ipython_handler)
+    except ImportError:
+        pass
+
+    return _traceback_reporter
+
+def uninstall_traceback_reporter():
+    """Flush and remove the exception reporter."""
+    global _traceback_reporter
+
+    if _traceback_reporter is None:
+        return
+    reporter, _traceback_reporter = _traceback_reporter, None
+
+    if getattr(sys.excepthook, 'reports_tracebacks', False):
+        sys.excepthook = sys.excepthook.previous
+    try:
+        from IPython import get_ipython
+        ip = get_ipython()
+        if ip is not None:
+            ip.set_custom_exc((), None)
+    except ImportError:
+        pass
+
+    reporter.close()
+
+def setdebug(debug=None, host=None, traceback_debugger_server=None, reset=False):
+    """Set debug environment variables."""
+    if reset:
+        # Safely remove environment variables
+        env_vars = [
+            'DEBUG', 'DEBUG_SERVER', 'DEBUGGER_SERVER', 
+            'TRACEBACK_DEBUG_SERVER', 'TRACEBACK_DEBUGGER_SERVER'
+        ]
+        for var in env_vars:
+            os.environ.pop(var, None)
+        uninstall_traceback_reporter()
+        print("Debug environment variables reset")
+        return
+    
+    if debug:
+        os.environ['DEBUG'] = str(debug)
+    
+    os.environ['DEBUG_SERVER'] = '1'
+    
+    if host:
+        os.environ['DEBUGGER_SERVER'] = host
+    
+    os.environ['TRACEBACK_DEBUG_SERVER'] = '1'
+    
+    if traceback_debugger_server:
+        os.environ['TRACEBACK_DEBUGGER_SERVER'] = str(traceback_debugger_server)
+        install_traceback_reporter(traceback_debugger_server)
+    
+    print("Debug environment configured")
+
+# print(f"os.getenv('LOGGING')    [1]: {os.getenv('LOGGING')}")
+# print(f"os.getenv('NO_LOGGING') [1]: {os.getenv('NO_LOGGING')}")
+
+def set_debug(debug=None, host=None, traceback_debugger_server=None, reset=False):
+    """Alias for setdebug()."""
+    setdebug(debug, host, traceback_debugger_server, reset)
+
+def kill_process(pid, sig=None):
+    """Kill a process by PID."""
+    
+    import signal
+
+    sig = sig or signal.SIGTERM
+
+    try:
+        os.kill(pid, sig)
+        print(f"Process {pid} terminated with signal {sig}")
+    except OSError as e:
+        print(f"Error killing process {pid}: {e}")
+
+def expand(env=None):
+    """Display environment variables."""
+    if env:
+        value = os.getenv(env)
+        if value is not None:
+            print(f"{env}={value}")
+        else:
+            print(f"Environment variable '{env}' not found")
+    else:
+        page_output(
+            _text_chunks(f"{key}={value}" for key, value in list(os.environ.items())),
+            title="environment"
+        )
+
+def now():
+    """Get current timestamp."""
+    from datetime import datetime
+    return datetime.now().ctime()
+
+_terminal_width = None
+
+def _invalidate_terminal_width(*args):
+    """Forget the cached width; each render calls this once on the main thread."""
+    global _terminal_width
+    _terminal_width = None
+
+def get_terminal_width():
+    """
+    Get terminal width with fallbacks.
+
+    The width is cached for the duration of one render: page_output()
+    and _render_rows() invalidate it first, so a resize between commands
+    is picked up without signal handlers (taking SIGWINCH over would
+    unhook readline's own resize handling).
+    """
+    global _terminal_width
+
+    if _terminal_width is not None:
+        return _terminal_width
+
+    width = 111  # Default width
+    
+    try:
+        import shutil
+        width = shutil.get_terminal_size()[0]
+    except ImportError:
+        try:
+            import cmdw
+            width = cmdw.getWidth()
+        except ImportError:
+            try:
+                width = os.get_terminal_size().columns
+            except OSError:
+                pass  # Use default width
+    
+    _terminal_width = width
+    return width
+
+# Paged output pipeline
+PAGER_CHUNK_LINES = 200     # source lines highlighted per chunk
+PAGER_READ_AHEAD = 3        # screens rendered ahead of the viewport
+PAGER_POLL = 0.1            # seconds between redraws while rendering
+
+_ANSI_RE = None
+
+def _strip_ansi(text):
+    global _ANSI_RE
+    import re
+
+    if _ANSI_RE is None:
+        _ANSI_RE = re.compile(r'\x1b\[[0-9;?]*[A-Za-z]')
+    return _ANSI_RE.sub('', text)
+
+def _stdout_is_terminal():
+    try:
+        return sys.stdout.isatty()
+    except (AttributeError, ValueError):
+        return False
+
+def _pager_interactive():
+    """True when output can be paged: a terminal on both ends and paging enabled."""
+    if not profile_enabled('pager') or sys.platform == 'win32':
+        return False
+    try:
+        return sys.stdin.isatty() and _stdout_is_terminal()
+    except (AttributeError, ValueError):
+        return False
+
+def _syntax_highlighter(width, line_numbers=False):
+    """Return highlight(lines, start_line) -> [ANSI lines], via rich, Pygments or plain text."""
+    color = _stdout_is_terminal()
+    rich_setup()
+    if color and rich_available():
+        try:
+            import io
+            from rich.console import Console
+            from rich.syntax import Syntax
+
+            color_system = Console().color_system or 'standard'
+
+            def highlight(lines, start_line):
+                buffer = io.StringIO()
+                console = Console(file=buffer, force_terminal=True, width=width, color_system=color_system)
+                console.print(Syntax(
+                    '\n'.join(lines),
+                    "python",
+                    theme='fruity',
+                    line_numbers=line_numbers,
+                    start_line=start_line,
+                    tab_size=2,
+                    code_width=width,
+                    word_wrap=True
+                ))
+                return buffer.getvalue().splitlines()
+
+            return highlight
+        except ImportError:
+            pass
+
+    def numbered(lines, start_line):
+        if not line_numbers:
+            return lines
+        digits = len(str(start_line + len(lines)))
+        return [f"{str(n).rjust(digits)} │ {line}" for n, line in enumerate(lines, start_line)]
+
+    try:
+        if not color:
+            raise ImportError("output is not a terminal")
+        from pygments import highlight as pygments_highlight
+        from pygments.formatters import Terminal256Formatter
+        from pygments.lexers import PythonLexer
+
+        lexer = PythonLexer(stripnl=False)
+        formatter = Terminal256Formatter(style='fruity')
+
+        def highlight(lines, start_line):
+            return numbered(pygments_highlight('\n'.join(lines), lexer, formatter).splitlines(), start_line)
+    except ImportError:
+        def highlight(lines, start_line):
+            return numbered(lines, start_line)
+
+    return highlight
+
+def _syntax_chunks(code, line_numbers=False, width=None):
+    """
+    Yield highlighted Python code a chunk at a time.
+
+    Chunks are cut in front of a top-level line where possible, so the
+    lexer restarts in a clean state.
+    """
+    highlight = _syntax_highlighter(width or get_terminal_width(), line_numbers)
+    lines = code.splitlines()
+    start = 0
+    while start < len(lines):
+        end = min(start + PAGER_CHUNK_LINES, len(lines))
+        limit = min(start + PAGER_CHUNK_LINES * 2, len(lines))
+        while end < limit and (not lines[end][:1].strip() or lines[end][:1] in ')]}'):
+            end += 1
+        yield highlight(lines[start:end], start + 1)
+        start = end
+
+def _text_chunks(lines, size=PAGER_CHUNK_LINES):
+    """Group an iterable of lines into lists of size lines."""
+    if isinstance(lines, list):
+        for start in range(0, len(lines), size):
+            yield lines[start:start + size]
+        return
+
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+class Pager:
+    """
+    Render output on a worker thread and show it in a built-in pager.
+
+    The worker consumes an iterable of line chunks only as far as the
+    viewport needs (plus PAGER_READ_AHEAD screens), so the first screen
+    appears immediately and huge outputs are rendered lazily while
+    scrolling. Output that fits on one screen is printed as is, and
+    output to something that isn't a terminal is streamed chunk by chunk
+    on the calling thread. Quitting or
+    Ctrl-C cancels the worker and always resets terminal styling.
+
+    Keys: space/f/b page, j/k/arrows line, d/u half page, g/G top/end,
+    / and ? search forward/backward, n/N repeat search, q quit.
+    """
+
+    def __init__(self, chunks, title=''):
+        self.title = title
+        self.lines = []
+        self.done = False
+        self.error = None
+        self._chunks = iter(chunks)
+        self._want = 0
+        self._cond = threading.Condition()
+        self._cancelled = False
+        self._keys = []
+        self._thread = threading.Thread(target=self._render, name='pager-render', daemon=True)
+
+    # -- worker --------------------------------------------------------
+
+    def _render(self):
+        try:
+            for chunk in self._chunks:
+                with self._cond:
+                    self.lines.extend(chunk)
+                    self._cond.notify_all()
+                    while len(self.lines) >= self._want and not self._cancelled:
+                        self._cond.wait()
+                    if self._cancelled:
+                        break
+        except Exception as e:
+            self.error = e
+        finally:
+            close = getattr(self._chunks, 'close', None)
+            if close is not None:
+                close()
+            with self._cond:
+                self.done = True
+                self._cond.notify_all()
+
+    def request(self, count):
+        """Ask the worker to render at least count lines."""
+        with self._cond:
+            if count > self._want:
+                self._want = count
+                self._cond.notify_all()
+
+    def wait_for(self, count, timeout=None):
+        """Wait until count lines are rendered or rendering is done."""
+        with self._cond:
+            return self._cond.wait_for(lambda: len(self.lines) >= count or self.done, timeout)
+
+    def cancel(self):
+        with self._cond:
+            self._cancelled = True
+            self._cond.notify_all()
+
+    # -- output --------------------------------------------------------
+
+    def run(self):
+        import shutil
+
+        if not _pager_interactive():
+            return self._stream()
+
+        height = shutil.get_terminal_size().lines - 1
+        self._thread.start()
+        self.request(height * PAGER_READ_AHEAD)
+        try:
+            self.wait_for(height + 1)
+        except KeyboardInterrupt:
+            self.cancel()
+            sys.stdout.write("\x1b[0m\n")
+            return
+
+        if self.done and len(self.lines) <= height:
+            if self.lines:
+                sys.stdout.write('\n'.join(self.lines) + '\x1b[0m\n')
+            sys.stdout.flush()
+        else:
+            self._interact()
+        if self.error is not None:
+            print(f"Error while rendering: {self.error}")
+
+    def _stream(self):
+        """Write chunks straight through as they are rendered (no paging)."""
+        out = sys.stdout
+        try:
+            for chunk in self._chunks:
+                if chunk:
+                    out.write('\n'.join(chunk) + '\n')
+        except KeyboardInterrupt:
+            out.write("\x1b[0m\n[output cancelled]\n")
+        finally:
+            close = getattr(self._chunks, 'close', None)
+            if close is not None:
+                close()
+            out.flush()
+
+    def _interact(self):
+        import re
+        import shutil
+        import termios
+        import tty
+
+        fd = sys.stdin.fileno()
+        saved = termios.tcgetattr(fd)
+        out = sys.stdout
+        top, pattern, backward, message, shown = 0, None, False, '', None
+        try:
+            tty.setcbreak(fd)
+            out.write('\x1b[?1049h\x1b[?25l\x1b[?7l')  # alternate screen, hide cursor, no wrap
+            while True:
+                cols, rows = shutil.get_terminal_size()
+                height = max(rows - 1, 1)
+                self.request(top + height * PAGER_READ_AHEAD)
+                self.wait_for(top + height, PAGER_POLL)
+                top = max(0, min(top, len(self.lines) - height))
+
+                state = (top, len(self.lines), self.done, message, cols, rows)
+                if state != shown:
+                    self._draw(out, top, height, cols, message)
+                    shown = state
+                message = ''
+
+                key = self._read_key(fd, None if self.done else PAGER_POLL)
+                if key is None:
+                    continue
+                if key in ('q', 'Q', '\x1b'):
+                    break
+                elif key in (' ', 'f', '\x06', '\x1b[6~'):
+                    top += height
+                elif key in ('b', '\x02', '\x1b[5~'):
+                    top -= height
+                elif key in ('j', 'e', '\r', '\n', '\x1b[B'):
+                    top += 1
+                elif key in ('k', 'y', '\x1b[A'):
+                    top -= 1
+                elif key == 'd':
+                    top += height // 2
+                elif key == 'u':
+                    top -= height // 2
+                elif key in ('g', '<', '\x1b[H', '\x1b[1~'):
+                    top = 0
+                elif key in ('G', '>', '\x1b[F', '\x1b[4~'):
+                    self._draw_status(out, cols, "rendering…")
+                    self.request(sys.maxsize)
+                    self.wait_for(sys.maxsize)
+                    top = len(self.lines) - height
+                elif key in ('/', '?'):
+                    text = self._prompt(fd, out, cols, key)
+                    if text:
+                        try:
+                            pattern = re.compile(text, re.IGNORECASE)
+                        except re.error:
+                            pattern = re.compile(re.escape(text), re.IGNORECASE)
+                        backward = key == '?'
+                    if text and pattern is not None:
+                        top, message = self._search(out, cols, pattern, top, backward)
+                    shown = None
+                elif key in ('n', 'N') and pattern is not None:
+                    top, message = self._search(out, cols, pattern, top, backward if key == 'n' else not backward)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.cancel()
+            out.write('\x1b[0m\x1b[?7h\x1b[?25h\x1b[?1049l')
+            out.flush()
+            termios.tcsetattr(fd, termios.TCSADRAIN, saved)
+
+    def _draw(self, out, top, height, cols, message):
+        visible = self.lines[top:top + height]
+        parts = ['\x1b[H']
+        for line in visible:
+            parts.append(f"{line}\x1b[0m\x1b[K\n")
+        parts.extend("~\x1b[K\n" for _ in range(height - len(visible)))
+        out.write(''.join(parts))
+        total = f"{len(self.lines)}{'' if self.done else '+'}"
+        status = message or (
+            f" {self.title}  lines {top + 1}-{top + len(visible)}/{total}"
+            f"  (q quit, / search, n/N next/prev)"
+        )
+        self._draw_status(out, cols, status)
+
+    def _draw_status(self, out, cols, text):
+        out.write(f"\x1b[7m{text[:cols].ljust(cols)}\x1b[0m\r")
+        out.flush()
+
+    def _read_key(self, fd, timeout):
+        """Return the next key (a character or escape sequence), None on timeout."""
+        import re
+        import select
+
+        if not self._keys:
+            ready, _, _ = select.select([fd], [], [], timeout)
+            if not ready:
+                return None
+            data = os.read(fd, 1024).decode('utf-8', errors='ignore')
+            self._keys.extend(re.findall(r'\x1b\[[0-9;]*[A-Za-z~]|\x1bO[A-Za-z]|.', data, re.DOTALL))
+            if not self._keys:
+                return None
+        key = self._keys.pop(0)
+        if key == '\x03':
+            raise KeyboardInterrupt
+        return key
+
+    def _prompt(self, fd, out, cols, prefix):
+        text = ''
+        out.write('\x1b[?25h')
+        try:
+            while True:
+                self._draw_status(out, cols, f"{prefix}{text}")
+                key = self._read_key(fd, None)
+                if key in ('\r', '\n'):
+                    return text
+                if key == '\x1b':
+                    return None
+                if key in ('\x7f', '\x08'):
+                    text = text[:-1]
+                elif key.isprintable():
+                    text += key
+        finally:
+            out.write('\x1b[?25l')
+
+    def _search(self, out, cols, pattern, top, backward=False):
+        """Return (new top, status message) for the next match of pattern."""
+        self._draw_status(out, cols, f"searching for {pattern.pattern}…")
+        if backward:
+            for i in range(min(top, len(self.lines)) - 1, -1, -1):
+                if pattern.search(_strip_ansi(self.lines[i])):
+                    return i, ''
+            return top, f" Pattern not found: {pattern.pattern}"
+
+        i = top + 1
+        while True:
+            while i < len(self.lines):
+                if pattern.search(_strip_ansi(self.lines[i])):
+                    return i, ''
+                i += 1
+            if self.done:
+                return top, f" Pattern not found: {pattern.pattern}"
+            self.request(i + PAGER_CHUNK_LINES * PAGER_READ_AHEAD)
+            self.wait_for(i + 1)
+
+def page_output(chunks, title=''):
+    """Render an iterable of line chunks in the background and page the result."""
+    _invalidate_terminal_width()
+    Pager(chunks, title).run()
+
+def page_text(text, title=''):
+    """Page plain text; written straight through when it can't be paged."""
+    if not _pager_interactive():
+        sys.stdout.write(text if text.endswith('\n') else text + '\n')
+        sys.stdout.flush()
+        return
+    page_output(_text_chunks(text.splitlines()), title)
+
+def page_source(code, line_numbers=False, title=''):
+    """Syntax-highlight and page Python source."""
+    if not line_numbers and not _stdout_is_terminal():
+        return page_text(code, title)
+    page_output(_syntax_chunks(code, line_numbers), title)
+
+SOURCE_CACHE_SIZE = 32       # files kept by _read_source_text()
+
+_source_cache = {}
+_source_cache_lock = threading.Lock()
+
+def _read_source_text(path):
+    """Read a UTF-8 text file through a small cache keyed by mtime and size."""
+    path = os.path.abspath(str(path))
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+    with _source_cache_lock:
+        cached = _source_cache.pop(path, None)
+        if cached is not None and cached[0] == key:
+            _source_cache[path] = cached  # most recently used goes last
+            _prefetch_note_use(f'file:{path}')
+            return cached[1]
+
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    with _source_cache_lock:
+        _source_cache[path] = (key, text)
+        while len(_source_cache) > SOURCE_CACHE_SIZE:
+            del _source_cache[next(iter(_source_cache))]
+    return text
+
+def get_source(source, real_linenumbers=False, copy_to_clipboard=False, no_lines=False):
+    """Display source code with syntax highlighting."""
+    import inspect
+    rich_setup()
+    try:
+        path = inspect.getsourcefile(source)
+    except TypeError:
+        path = None
+    if path:
+        import linecache
+        if path in linecache.cache:
+            _prefetch_note_use(f'file:{os.path.abspath(path)}')
+        _remember_view(path)
+    if sys.version_info.major == 3:
+        if not rich_available():
+            print("Rich library not available. Install with: pip install rich")
+            try:
+                page_source(inspect.getsource(source), title=path or '')
+            except OSError as e:
+                print(f"Error: Could not retrieve source code. {e}")
+            return
+        
+        try:
+            # ⭐ FIX: use real line numbers
+            # real line numbers support (works on old rich)
+            if real_linenumbers:
+                lines, start_line = inspect.getsourcelines(source)
+            else:
+                lines = inspect.getsource(source).splitlines(True)
+                start_line = 1
+
+            # build numbered code manually
+            if not no_lines:
+                width = len(str(start_line + len(lines) - 1))
+                numbered = []
+
+                for i, line in enumerate(lines, start=start_line):
+                    numbered.append(f"{str(i).rjust(width)} │ {line}")
+
+                source_code = "".join(numbered)
+            else:
+                source_code = "".join(lines)
+
+            # get full path
+            try:
+                file_path = inspect.getsourcefile(source) or inspect.getfile(source)
+            except Exception:
+                file_path = "Unknown"
+
+            try:
+                from rich import print as _print
+            except:
+                from make_colors import Console, syntax, print as _print  # type: ignore
+
+            
+            _print(
+                f"[#000000 on #FFFF00]FILE:[/] "
+                f"[#FFFFFF on #0000FF]{file_path}:{start_line}[/]"
+            )
+
+            if copy_to_clipboard:
+                import clipboard
+                clipboard.copy(source_code)
+                print("Source code copied to clipboard")
+
+            _prefetch_note_use('lexer:python')
+            # line numbers are already part of source_code
+            page_source(source_code, title=f"{file_path}:{start_line}")
+            print(f"WIDTH: {get_terminal_width()}")
+
+        except OSError as e:
+            print(f"Error: Could not retrieve source code. {e}")
+        except Exception as e:
+            print(f"Unexpected error: {e}")
+
+    else:
+        try:
+            cmd = """python3 -c \"import {};import inspect;from rich.console import Console;from rich.syntax import Syntax;console = Console();console.print(Syntax(inspect.getsource({}), 'python', theme = 'fruity', line_numbers=True, tab_size=2, code_width={}))\"""".format(source.__module__, source.__module__, get_terminal_width())
+            os.system(cmd)
+        except:
+            cmd = """python3 -c \"import {};import inspect;from rich.console import Console;from rich.syntax import Syntax;console = Console();console.print(Syntax(inspect.getsource({}), 'python', theme = 'fruity', line_numbers=True, tab_size=2, code_width={}))\"""".format(source.__name__, source.__name__, get_terminal_width())
+            os.system(cmd)
+
+def get_class_name(item):
+    """
+    Return class name for all object types with proper error handling
+    """
+    try:
+        # Handle class
+        if hasattr(item, '__name__') and not hasattr(item, '__self__'):
+            # Check if it's a class or function
+            if hasattr(item, '__bases__'):
+                return item.__name__  # It's a class
+            elif hasattr(item, '__qualname__') and '.' in item.__qualname__:
+                # It's a method (bound or unbound)
+                return item.__qualname__.split('.')[-2]
+            else:
+                # It's a regular function
+                return 'function'
+        
+        # Handle instance method (bound method)
+        elif hasattr(item, '__self__'):
+            return item.__self__.__class__.__name__
+        
+        # Handle instance
+        elif hasattr(item, '__class__'):
+            return item.__class__.__name__
+        
+        else:
+            return str(type(item))
+            
+    except Exception as e:
+        # return f"Error: {type(e).__name__}"
+        return None
+
+def get_full_method_name(method):
+    try:
+        # Get the qualname (ex: "Publisher.publish")
+        if hasattr(method, '__qualname__'):
+            # For methods from classes
+            return method.__qualname__
+        else:
+            # Fallback
+            return method.__name__
+    except:
+        return None
+
+def read_file(file_path: Any, method_or_class: Optional[str] = None) -> Optional[str]:
+    """Read and display a Python file with syntax highlighting."""
+
+    rich_setup()
+    pyread_setup()
+
+    try:
+        from pathlib3 import Path
+    except:
+        from pathlib import Path
+
+    path = Path(file_path)
+    
+    if not path.exists():
+        print(f"Error: File '{path}' does not exist.")
+        return None
+    
+    if not path.is_file():
+        print(f"Error: '{path}' is not a file.")
+        return None
+    
+    try:
+        content = _read_source_text(path)
+        _remember_view(path)
+        
+        if not rich_available():
+            print("Rich library not available. Displaying plain text:")
+            page_text(content, title=str(path))
+            return content
+        
+        from rich.console import Console
+        console = Console()
+        
+        # Display structure analysis if pyread is available
+        if pyread_available():
+            try:
+                from pyread import CodeAnalyzer  # type: ignore
+                analyzer = CodeAnalyzer()
+                print(f"Path: {path}")
+                analyzer.process_file(str(path))
+                
+                method_name = None
+
+                if method_or_class:
+                    class_name = get_class_name(method_or_class)
+                    method_name = get_full_method_name(method_or_class)
+                    if method_name and method_name == class_name:
+                        method_name = None
+                    print(f"Class Name: {class_name}")
+                    print(f"Method Name: {method_name}") if method_name else None
+                    if method_name and '.' in method_name:  # type: ignore
+                        class_name, method_name = method_name.split('.', 1)  # type: ignore
+                    
+                    elements = analyzer.find_code_elements(method_name, class_name)
+                    
+                    if elements:
+                        analyzer.display_multiple_elements(elements, 'fruity')
+                    else:
+                        if class_name:
+                            console.print(f"[red]❌ Method '{method_name}' not found in class '{class_name}'[/]")
+                        else:
+                            console.print(f"[red]❌ Function/method '{method_name}' not found[/]")
+                #     get_source(method_or_class)
+
+                # class_name = get_class_name(method_or_class)
+                # print(f"Class Name: {class_name}")
+                
+                # method_name = get_full_method_name(method_or_class)
+                # if method_name and method_name == class_name:
+                #     method_name = None
+                # # else:
+                # print(f"Method Name [1]: {method_name}") if method_name else None
+                # if not method_name:
+                #     method_name = get_full_method_name(method_or_class)
+                # print(f"Method Name [2]: {method_name}") if method_name else None
+                # if method_name and '.' in method_name:
+                #     class_name, method_name = method_name.split('.', 1)
+                #     print(f"Method Name [3]: {method_name}") if method_name else None
+                
+                analyzer.print_structure(method_name, True)
+                if not method_name:
+                    get_source(method_or_class)
+                print()  # Add spacing
+                
+            except Exception as e:
+                print(f"Warning: Could not analyze file structure: {e}")
+                tprint(e, show_emoji=True)  # type: ignore
+            return 
+        else:
+            from warnings import warn
+            warn("Pyread library not available. Install with: pip install pyread")
+        # Display source code with syntax highlighting
+        console.print(f"[bold #00FF88]📄 Complete Source Code:[/] [bold #55FFFF]{path}[/]\n")
+        _prefetch_note_use('lexer:python')
+        page_source(content, line_numbers=True, title=str(path))
+        
+        # return content
+        
+    except UnicodeDecodeError:
+        print(f"Error: Could not decode file '{path}'. Check file encoding.")
+        return None
+    except Exception as e:
+        print(f"Error reading file '{path}': {e}")
+        return None
+
+def read_module_or_file(path: Any) -> Optional[str]:
+    """
+    Read either a file path or import a module and display its source.
+    
+    Args:
+        path: File path or module name (with dots for submodules)
+        
+    Returns:
+        Content if successful, None otherwise
+    """
+    
+    import inspect
+    
+    # First try as a file path
+    try:
+        if os.path.isfile(path):
+            if detect_data_format(path):
+                return peek(path)
+            return read_file(path)
+    except Exception:
+        pass
+    
+    # Try as a module name
+    if path in sys.modules:
+        get_source(sys.modules[path])
+        return None
+
+    try:
+        file_path = inspect.getfile(path)
+        return read_file(file_path, path)
+    except TypeError:
+        pass
+    except Exception:
+        pass
+    
+    # Try importing as module
+    if "." in path:
+        try:
+            import importlib
+            module = importlib.import_module(path)
+            get_source(module)
+            return None
+        except ImportError as e:
+            print(f"Error importing module '{path}': {e}")
+            return None
+    
+    # Try as local Python file
+    try:
+        from pathlib3 import Path
+    except:
+        from pathlib import Path
+
+    local_file = Path(f"{path}.py")
+    if local_file.exists():
+        return read_file(local_file)  
+    
+    print(f"Error: Could not find file or module '{path}'")
+    return None
+
+# Data file preview (streaming, constant memory)
+DATA_FILE_FORMATS = {
+    '.csv': 'csv',
+    '.tsv': 'tsv',
+    '.tab': 'tsv',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+}
+PEEK_SCAN_ROWS = 10000      # rows scanned for schema inference
+PEEK_MAX_CELL = 40          # max characters per rendered cell
+TAIL_BLOCK_SIZE = 64 * 1024
+NULL_VALUES = ('', 'null', 'none', 'na', 'n/a', 'nan')
+
+def detect_data_format(path):
+    """Return 'csv', 'tsv', 'jsonl' or 'parquet' for a data file, None otherwise."""
+    fmt = DATA_FILE_FORMATS.get(os.path.splitext(str(path))[1].lower())
+    if fmt:
+        return fmt
+    try:
+        with open(path, 'rb') as f:
+            if f.read(4) == b'PAR1':
+                return 'parquet'
+    except OSError:
+        pass
+    return None
+
+def _head_lines(path, n, skip_blank=False):
+    """Return the first n lines (bytes) of a file using mmap, optionally not counting blank ones."""
+    import mmap
+
+    lines = []
+    with open(path, 'rb') as f:
+        if n <= 0 or os.fstat(f.fileno()).st_size == 0:
+            return lines
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start, size = 0, len(mm)
+            while len(lines) < n and start < size:
+                end = mm.find(b'\n', start)
+                if end == -1:
+                    end = size
+                line = mm[start:end].rstrip(b'\r')
+                if line.strip() or not skip_blank:
+                    lines.append(line)
+                start = end + 1
+    return lines
+
+def _tail_lines(f, n, block_size=TAIL_BLOCK_SIZE):
+    """
+    Return the last n lines (bytes) of an open binary file.
+
+    Reads fixed-size blocks backwards from EOF until enough newlines
+    are seen, so only the tail of the file is ever read. The file
+    position is left at EOF.
+    """
+    f.seek(0, os.SEEK_END)
+    end = pos = f.tell()
+    if n <= 0 or end == 0:
+        return []
+
+    blocks = []
+    newlines = 0
+    while pos > 0 and newlines <= n:
+        step = min(block_size, pos)
+        pos -= step
+        f.seek(pos)
+        block = f.read(step)
+        newlines += block.count(b'\n')
+        blocks.append(block)
+
+    f.seek(end)
+    lines = b''.join(reversed(blocks)).split(b'\n')
+    if lines[-1] == b'':
+        lines.pop()
+    return [line.rstrip(b'\r') for line in lines[-n:]]
+
+def _tail_matching(f, n, match, block_size=TAIL_BLOCK_SIZE):
+    """
+    Return the last n lines (bytes) of an open binary file for which
+    match(line) is true, reading blocks backwards from EOF.
+
+    Only matching lines are kept, so memory stays bounded by n even when
+    the whole file has to be scanned. The file position is left at EOF.
+    """
+    f.seek(0, os.SEEK_END)
+    end = pos = f.tell()
+    found = []
+    partial = None  # head of the line cut by the last block boundary
+    while pos > 0 and len(found) < n:
+        step = min(block_size, pos)
+        pos -= step
+        f.seek(pos)
+        data = f.read(step)
+        if partial is None:
+            lines = data.split(b'\n')
+            if lines[-1] == b'':
+                lines.pop()
+        else:
+            lines = (data + partial).split(b'\n')
+        partial = lines.pop(0) if pos > 0 and lines else None
+        for line in reversed(lines):
+            line = line.rstrip(b'\r')
+            if match(line):
+                found.append(line)
+                if len(found) == n:
+                    break
+    f.seek(end)
+    return found[::-1]
+
+def _tail_records(f, n, block_size=TAIL_BLOCK_SIZE):
+    """
+    Return (data, at_start): the bytes holding the last n CSV/TSV records
+    of an open binary file, and whether they begin at the start of the file.
+
+    Like _tail_lines(), but a newline only ends a record when an even
+    number of double quotes follows it up to EOF, so quoted fields that
+    span lines stay whole (exact for files whose quotes are balanced).
+    """
+    f.seek(0, os.SEEK_END)
+    end = pos = f.tell()
+    if n <= 0 or end == 0:
+        return b'', False
+
+    blocks = []
+    boundaries = []  # file offsets of record-ending newlines, last first
+    quotes = 0
+    trailing = True  # the newline terminating the last record isn't a boundary
+    while pos > 0 and len(boundaries) < n:
+        step = min(block_size, pos)
+        pos -= step
+        f.seek(pos)
+        block = f.read(step)
+        blocks.append(block)
+
+        hi = len(block)
+        while len(boundaries) < n:
+            i = block.rfind(b'\n', 0, hi)
+            if i == -1:
+                break
+            quotes += block.count(b'"', i + 1, hi)
+            hi = i
+            if trailing and pos + i == end - 1:
+                continue
+            trailing = False
+            if quotes % 2 == 0:
+                boundaries.append(pos + i)
+        quotes += block.count(b'"', 0, hi)
+        trailing = False
+
+    data = b''.join(reversed(blocks))
+    if len(boundaries) < n:
+        return data, True
+    return data[boundaries[-1] + 1 - pos:], False
+
+def _reservoir_sample(items, k, seed=None):
+    """Uniform random sample of k items from an iterable of unknown length."""
+    import random
+
+    rng = random.Random(seed)
+    sample = []
+    for i, item in enumerate(items):
+        if i < k:
+            sample.append(item)
+        else:
+            j = rng.randrange(i + 1)
+            if j < k:
+                sample[j] = item
+    return sample
+
+def _infer_value_type(value):
+    """Infer a column type name for a single value, None for nulls."""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return 'bool'
+    if isinstance(value, int):
+        return 'int'
+    if isinstance(value, float):
+        return 'float'
+    if not isinstance(value, str):
+        return type(value).__name__
+
+    text = value.strip()
+    if text.lower() in NULL_VALUES:
+        return None
+    if text.lower() in ('true', 'false'):
+        return 'bool'
+    try:
+        int(text)
+        return 'int'
+    except ValueError:
+        pass
+    try:
+        float(text)
+        return 'float'
+    except ValueError:
+        return 'str'
+
+def _merge_types(types):
+    """Collapse the set of types seen in a column into one name."""
+    if not types:
+        return 'null'
+    if types == {'int', 'float'}:
+        return 'float'
+    return '|'.join(sorted(types))
+
+def _iter_text_records(path, fmt):
+    """Yield rows of a CSV/TSV/JSONL file as dicts, streaming line by line."""
+    import csv
+    import json
+
+    with open(path, 'r', encoding='utf-8', errors='replace', newline='') as f:
+        if fmt == 'jsonl':
+            for line in f:
+                if line.strip():
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        record = {'<invalid>': line.rstrip('\r\n')}
+                    yield record if isinstance(record, dict) else {'value': record}
+            return
+
+        delimiter = '\t' if fmt == 'tsv' else ','
+        reader = csv.reader(f, delimiter=delimiter)
+        header = next(reader, None)
+        if header is None:
+            return
+        for row in reader:
+            yield dict(zip(header, row))
+
+def _parse_jsonl_lines(lines):
+    """Parse raw JSONL lines (bytes) into dicts."""
+    import json
+
+    rows = []
+    for line in lines:
+        line = line.decode('utf-8', errors='replace')
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = {'<invalid>': line}
+        rows.append(record if isinstance(record, dict) else {'value': record})
+    return rows
+
+def _text_header(path, fmt):
+    """Return the CSV/TSV header row, None for JSONL."""
+    if fmt == 'jsonl':
+        return None
+    import csv
+    delimiter = '\t' if fmt == 'tsv' else ','
+    with open(path, 'r', encoding='utf-8', errors='replace', newline='') as f:
+        return next(csv.reader(f, delimiter=delimiter), [])
+
+def _parquet_file(path):
+    """Open a Parquet file with pyarrow (memory mapped), None if unavailable."""
+    try:
+        import pyarrow.parquet as pq  # type: ignore
+    except ImportError:
+        print("pyarrow not available. Install with: pip install pyarrow")
+        return None
+    return pq.ParquetFile(str(path), memory_map=True)
+
+def _peek_parquet(path, n, mode, seed=None):
+    from collections import deque
+
+    pf = _parquet_file(path)
+    if pf is None:
+        return None
+    meta = pf.metadata
+
+    if mode == 'schema':
+        schema = {}
+        for j, field in enumerate(pf.schema_arrow):
+            nulls = 0
+            for g in range(meta.num_row_groups):
+                stats = meta.row_group(g).column(j).statistics
+                if stats is not None and stats.has_null_count:
+                    nulls += stats.null_count
+            schema[field.name] = {'type': str(field.type), 'nulls': nulls, 'count': meta.num_rows}
+        return schema
+
+    if mode == 'head':
+        for batch in pf.iter_batches(batch_size=max(n, 1)):
+            return batch.to_pylist()[:n]
+        return []
+
+    if mode == 'tail':
+        rows = deque(maxlen=n)
+        groups, needed = [], n
+        for g in range(meta.num_row_groups - 1, -1, -1):
+            groups.insert(0, g)
+            needed -= meta.row_group(g).num_rows
+            if needed <= 0:
+                break
+        for batch in pf.iter_batches(batch_size=65536, row_groups=groups):
+            rows.extend(batch.slice(max(batch.num_rows - n, 0)).to_pylist())
+        return list(rows)
+
+    # sample: row count is known from metadata, so pick indices up front
+    import random
+    rng = random.Random(seed)
+    wanted = sorted(rng.sample(range(meta.num_rows), min(n, meta.num_rows)))
+    rows, offset, i = [], 0, 0
+    for batch in pf.iter_batches(batch_size=65536):
+        local = []
+        while i < len(wanted) and wanted[i] < offset + batch.num_rows:
+            local.append(wanted[i] - offset)
+            i += 1
+        if local:
+            rows.extend(batch.take(local).to_pylist())
+        offset += batch.num_rows
+        if i >= len(wanted):
+            break
+    return rows
+
+def peek_data(path, n=10, mode='head', scan_rows=PEEK_SCAN_ROWS, seed=None):
+    """
+    Stream a preview of a CSV/TSV, JSONL or Parquet file without loading it.
+
+    Args:
+        path: Data file path
+        n: Number of rows for head/tail/sample
+        mode: 'head', 'tail', 'sample' or 'schema'
+        scan_rows: Rows scanned to infer the schema
+        seed: Random seed for 'sample'
+
+    Returns:
+        List of row dicts, or a {column: {type, nulls, count}} dict for
+        'schema'. None if the file can't be previewed.
+    """
+    import itertools
+
+    if not os.path.isfile(path):
+        print(f"Error: File '{path}' does not exist.")
+        return None
+    fmt = detect_data_format(path)
+    if fmt is None:
+        print(f"Error: '{path}' is not a CSV, TSV, JSONL or Parquet file.")
+        return None
+    if mode not in ('head', 'tail', 'sample', 'schema'):
+        print(f"Error: unknown peek mode '{mode}'. Use head, tail, sample or schema.")
+        return None
+
+    if fmt == 'parquet':
+        return _peek_parquet(path, n, mode, seed)
+
+    if mode == 'schema':
+        types, nulls, present = {}, {}, {}
+        count = 0
+        for record in itertools.islice(_iter_text_records(path, fmt), scan_rows):
+            count += 1
+            for key, value in record.items():
+                if key not in types:
+                    types[key], nulls[key], present[key] = set(), 0, 0
+                present[key] += 1
+                kind = _infer_value_type(value)
+                if kind is None:
+                    nulls[key] += 1
+                else:
+                    types[key].add(kind)
+        # JSONL keys missing from a record count as nulls too
+        return {
+            key: {'type': _merge_types(types[key]), 'nulls': nulls[key] + count - present[key], 'count': count}
+            for key in types
+        }
+
+    if mode == 'sample':
+        return _reservoir_sample(_iter_text_records(path, fmt), n, seed)
+
+    if fmt == 'jsonl':
+        if mode == 'head':
+            return _parse_jsonl_lines(_head_lines(path, n, skip_blank=True))
+        # blank lines don't count towards n: widen the window until they're covered
+        with open(path, 'rb') as f:
+            want = n
+            while True:
+                lines = _tail_lines(f, want)
+                records = [line for line in lines if line.strip()]
+                if len(records) >= n or len(lines) < want:
+                    return _parse_jsonl_lines(records[-n:] if n else [])
+                want *= 2
+
+    # CSV/TSV records may span lines inside quoted fields
+    if mode == 'head':
+        return list(itertools.islice(_iter_text_records(path, fmt), n))
+
+    import csv
+    import io
+
+    header = _text_header(path, fmt)
+    with open(path, 'rb') as f:
+        data, at_start = _tail_records(f, n)
+    text = io.StringIO(data.decode('utf-8', errors='replace'), newline='')
+    rows = list(csv.reader(text, delimiter='\t' if fmt == 'tsv' else ','))
+    if at_start:
+        rows = rows[1:]  # the whole file fits, drop the header row
+    return [dict(zip(header, row)) for row in rows[-n:]] if n else []
+
+def _render_rows(title, rows):
+    """Render a list of row dicts as a table (rich if available)."""
+    columns = []
+    for row in rows:
+        for key in row:
+            if key not in columns:
+                columns.append(key)
+
+    def cell(value):
+        text = '' if value is None else str(value).replace('\r\n', '⏎').replace('\n', '⏎').replace('\r', '⏎')
+        return text if len(text) <= PEEK_MAX_CELL else text[:PEEK_MAX_CELL - 1] + '…'
+
+    rich_setup()
+    if rich_available():
+        try:
+            from rich.console import Console
+            from rich.table import Table
+
+            table = Table(title=title, title_justify='left', show_lines=False)
+            for column in columns:
+                table.add_column(str(column), overflow='ellipsis')
+            for row in rows:
+                table.add_row(*[cell(row.get(column)) for column in columns])
+            _invalidate_terminal_width()
+            Console(width=get_terminal_width()).print(table)
+            return
+        except ImportError:
+            pass
+
+    print(title)
+    widths = [len(str(column)) for column in columns]
+    cells = [[cell(row.get(column)) for column in columns] for row in rows]
+    for values in cells:
+        widths = [max(w, len(v)) for w, v in zip(widths, values)]
+    print(" │ ".join(str(c).ljust(w) for c, w in zip(columns, widths)))
+    print("─┼─".join("─" * w for w in widths))
+    for values in cells:
+        print(" │ ".join(v.ljust(w) for v, w in zip(values, widths)))
+
+def peek(path, n=10, mode='head', scan_rows=PEEK_SCAN_ROWS, seed=None):
+    """Display the head/tail/sample/schema of a CSV, TSV, JSONL or Parquet file."""
+    data = peek_data(path, n, mode, scan_rows, seed)
+    if data is None:
+        return None
+
+    fmt = detect_data_format(path)
+    size = os.path.getsize(path)
+    if mode == 'schema':
+        rows = [{'column': key, **info} for key, info in data.items()]
+        title = f"{path} [{fmt}, {size:,} bytes] schema"
+        if fmt != 'parquet':
+            title += f" (first {scan_rows:,} rows)"
+        _render_rows(title, rows)
+    else:
+        _render_rows(f"{path} [{fmt}, {size:,} bytes] {mode} {len(data)}", data)
+
+# Log tail / follow
+TAIL_POLL_MIN = 0.1         # seconds, polling fallback when data is flowing
+TAIL_POLL_MAX = 2.0         # seconds, polling fallback when the file is idle
+TAIL_ROTATE_CHECK = 1.0     # seconds between rotation checks under inotify
+
+class _Inotify:
+    """Minimal ctypes inotify watcher for a single file (Linux only)."""
+
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+
+    def __init__(self, path):
+        import ctypes
+        import ctypes.util
+
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = self.IN_MODIFY | self.IN_ATTRIB | self.IN_DELETE_SELF | self.IN_MOVE_SELF
+        if self._libc.inotify_add_watch(self.fd, os.fsencode(str(path)), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {path}")
+
+    def wait(self, timeout):
+        """Block until the file changes or timeout expires."""
+        import select
+
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if ready:
+            try:
+                while os.read(self.fd, 4096):
+                    pass
+            except BlockingIOError:
+                pass
+        return bool(ready)
+
+    def close(self):
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+def _tail_waiter(path):
+    """Return an inotify watcher for path, or None to fall back to polling."""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        return _Inotify(path)
+    except (OSError, AttributeError):
+        return None
+
+def _colorize_levels(line):
+    """Wrap log level names (see CUSTOM_LOG_LEVELS) in ANSI colors."""
+    global _LOG_LEVEL_RE
+    import re
+
+    if _LOG_LEVEL_RE is None:
+        _LOG_LEVEL_RE = re.compile(r'\b(' + '|'.join(CUSTOM_LOG_LEVELS) + r')\b')
+    return _LOG_LEVEL_RE.sub(lambda m: f"\x1b[{LOG_LEVEL_COLORS[m.group(1)]}m{m.group(1)}\x1b[0m", line)
+
+_LOG_LEVEL_RE = None
+
+def tail(path, n=100, follow=False, grep=None, color=None):
+    """
+    Show the last n lines of a file, optionally following new output.
+
+    Args:
+        path: Log file path
+        n: Number of lines to show
+        follow: Keep printing appended lines until Ctrl-C (survives rotation)
+        grep: Regex (string or compiled) lines must match to be shown; the
+            last n matching lines are shown, however far back they are
+        color: Colorize log level names; defaults to True on a terminal
+    """
+    import re
+
+    if not os.path.isfile(path):
+        print(f"Error: File '{path}' does not exist.")
+        return None
+
+    try:
+        pattern = re.compile(grep) if isinstance(grep, str) else grep
+    except re.error as e:
+        print(f"Error: invalid regex '{grep}': {e}")
+        return None
+    if color is None:
+        color = sys.stdout.isatty()
+
+    def decode(raw):
+        return raw.rstrip(b'\r').decode('utf-8', errors='replace')
+
+    def emit(raw):
+        line = decode(raw)
+        if pattern is not None and not pattern.search(line):
+            return
+        print(_colorize_levels(line) if color else line)
+
+    f = open(path, 'rb')
+    try:
+        if pattern is None:
+            lines = _tail_lines(f, n)
+        else:
+            lines = _tail_matching(f, n, lambda raw: pattern.search(decode(raw)))
+        for raw in lines:
+            emit(raw)
+        if follow:
+            _follow(f, path, emit)
+    except KeyboardInterrupt:
+        print()
+    finally:
+        f.close()
+
+def _follow(f, path, emit):
+    """Print lines appended to f until Ctrl-C, reopening it on rotation. Closes f."""
+    import time
+
+    waiter = _tail_waiter(path)
+    delay = TAIL_POLL_MIN
+    pending = b''
+    try:
+        while True:
+            chunk = f.read(TAIL_BLOCK_SIZE)
+            if chunk:
+                lines = (pending + chunk).split(b'\n')
+                pending = lines.pop()
+                for raw in lines:
+                    emit(raw)
+                delay = TAIL_POLL_MIN
+                continue
+
+            # At EOF: check for rotation (new inode) or truncation
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                st = None
+            if st is not None:
+                if st.st_ino != os.fstat(f.fileno()).st_ino:
+                    if pending:
+                        emit(pending)
+                        pending = b''
+                    f.close()
+                    f = open(path, 'rb')
+                    print(f"==> {path} rotated, reopened <==")
+                    if waiter is not None:
+                        waiter.close()
+                        waiter = _tail_waiter(path)
+                    continue
+                if st.st_size < f.tell():
+                    print(f"==> {path} truncated <==")
+                    f.seek(0)
+                    pending = b''
+                    continue
+
+            if waiter is not None:
+                waiter.wait(TAIL_ROTATE_CHECK)
+            else:
+                time.sleep(delay)
+                delay = min(delay * 2, TAIL_POLL_MAX)
+    finally:
+        f.close()
+        if waiter is not None:
+            waiter.close()
+
+# Watch expressions in the background
+WATCH_HISTORY = 120         # samples kept per watch
+WATCH_SPARK_WIDTH = 40      # samples shown in the sparkline
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+def _sparkline(values):
+    """Render a sequence of floats as a unicode sparkline (NaN as a gap)."""
+    import math
+
+    finite = [v for v in values if not math.isnan(v)]
+    if not finite:
+        return ""
+    low, high = min(finite), max(finite)
+    scale = (len(SPARK_CHARS) - 1) / (high - low) if high > low else 0
+    return "".join(
+        " " if math.isnan(v) else SPARK_CHARS[int((v - low) * scale)]
+        for v in values
+    )
+
+def _ipython_prompt_session():
+    """IPython's prompt_toolkit PromptSession, None outside a terminal IPython."""
+    ipython = sys.modules.get('IPython')
+    ip = ipython.get_ipython() if ipython is not None else None
+    return getattr(ip, 'pt_app', None)
+
+def _print_above_prompt(text):
+    """Print a line from a background thread, then redraw the current input line."""
+    session = _ipython_prompt_session()
+    app = getattr(session, 'app', None)
+    if app is not None and app.is_running:
+        # prompt_toolkit owns the screen: let it hide and redraw the prompt
+        from prompt_toolkit.application import run_in_terminal
+        from prompt_toolkit.application.current import set_app
+
+        def show():
+            with set_app(app):
+                run_in_terminal(lambda: print(text))
+
+        app.loop.call_soon_threadsafe(show)
+        return
+
+    ipython = sys.modules.get('IPython')
+    prompt = getattr(sys, 'ps1', None)
+    prompt = getattr(prompt, 'prompt', prompt)  # don't trigger a _PromptHook
+    if prompt is None or (ipython is not None and ipython.get_ipython() is not None):
+        sys.stdout.write(f"{text}\n")
+    else:
+        readline = sys.modules.get('readline')
+        try:
+            buffer = readline.get_line_buffer() if readline else ""
+        except Exception:
+            buffer = ""
+        sys.stdout.write(f"\r\x1b[2K{text}\n{prompt}{buffer}")
+    sys.stdout.flush()
+
+class Watch:
+    """
+    Evaluate an expression periodically on a background thread.
+
+    Ticks are scheduled on a fixed grid (start + k * interval) so the
+    period doesn't drift. Ticks an evaluation overran are skipped
+    instead of queued, and an evaluation that takes longer than its
+    budget also skips the next tick, so a slow expression backs off
+    rather than piling up or hogging the GIL. Numeric results are kept in an
+    array('d') ring buffer of WATCH_HISTORY samples.
+
+    A live watch shows its line in IPython's bottom toolbar, updated in
+    place; in the plain REPL it is printed above the prompt only when the
+    value (or error) changes.
+    """
+
+    def __init__(self, wid, expr, interval=1.0, namespace=None, budget=None,
+                 live=True, size=WATCH_HISTORY):
+        import threading
+        from array import array
+
+        self.id = wid
+        self.expr = expr
+        self.interval = float(interval)
+        self.budget = float(budget) if budget is not None else self.interval * 0.5
+        self.live = live
+        self.namespace = namespace if namespace is not None else {}
+        self.values = array('d', [float('nan')] * size)
+        self.times = array('d', [float('nan')] * size)
+        self.count = 0
+        self.skipped = 0
+        self.last = None
+        self.error = None
+        self._shown = None
+        self._code = compile(expr, f"<watch {wid}>", 'eval') if isinstance(expr, str) else None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"watch-{wid}", daemon=True)
+        self._thread.start()
+
+    @property
+    def running(self):
+        return self._thread.is_alive() and not self._stop.is_set()
+
+    def cancel(self):
+        self._stop.set()
+        if self.live:
+            _update_watch_toolbar()
+
+    def history(self):
+        """Return (times, values) of the stored samples, oldest first."""
+        size = len(self.values)
+        start = self.count % size if self.count >= size else 0
+        n = min(self.count, size)
+        order = [(start + i) % size for i in range(n)]
+        return [self.times[i] for i in order], [self.values[i] for i in order]
+
+    def rate(self):
+        """Rate of change per second over the last two numeric samples."""
+        import math
+
+        times, values = self.history()
+        points = [(t, v) for t, v in zip(times, values) if not math.isnan(v)]
+        if len(points) < 2 or points[-1][0] == points[-2][0]:
+            return None
+        (t0, v0), (t1, v1) = points[-2], points[-1]
+        return (v1 - v0) / (t1 - t0)
+
+    def render(self):
+        _, values = self.history()
+        rate = self.rate()
+        status = f"error: {self.error}" if self.error else f"{self.last!r:.40}"
+        line = f"[{self.id}] {self.expr if self._code else getattr(self.expr, '__name__', self.expr)} = {status}"
+        spark = _sparkline(values[-WATCH_SPARK_WIDTH:])
+        if spark:
+            line += f"  {spark}"
+        if rate is not None:
+            line += f"  Δ {rate:+.4g}/s"
+        if self.skipped:
+            line += f"  (skipped {self.skipped})"
+        return line
+
+    def _evaluate(self):
+        if self._code is not None:
+            return eval(self._code, self.namespace)
+        return self.expr()
+
+    def _record(self, when, value):
+        import numbers
+
+        slot = self.count % len(self.values)
+        self.times[slot] = when
+        self.values[slot] = float(value) if isinstance(value, numbers.Real) else float('nan')
+        self.count += 1
+
+    def _publish(self):
+        if _update_watch_toolbar():
+            return
+        status = (self.error, repr(self.last))
+        if status != self._shown:
+            self._shown = status
+            _print_above_prompt(self.render())
+
+    def _run(self):
+        import math
+        import time
+
+        start = time.monotonic()
+        tick = 0
+        while not self._stop.is_set():
+            began = time.monotonic()
+            try:
+                value = self._evaluate()
+                self.last, self.error = value, None
+            except Exception as e:
+                value, self.error = None, f"{type(e).__name__}: {e}"
+            self._record(time.time(), value)
+            elapsed = time.monotonic() - began
+
+            if self.live:
+                self._publish()
+
+            tick += 1
+            next_at = start + tick * self.interval
+            missed = max(0, math.ceil((time.monotonic() - next_at) / self.interval))
+            if elapsed > self.budget:
+                missed = max(missed, 1)
+            if missed:
+                self.skipped += missed
+                tick += missed
+                next_at = start + tick * self.interval
+            self._stop.wait(max(0.0, next_at - time.monotonic()))
+
+_watches = {}
+_watch_ids = iter(range(1, sys.maxsize))
+
+def _watch_toolbar():
+    return '\n'.join(w.render() for w in list(_watches.values()) if w.live and w.running)
+
+def _update_watch_toolbar():
+    """Show live watches in IPython's bottom toolbar; False when there is no such toolbar."""
+    session = _ipython_prompt_session()
+    if session is None:
+        return False
+    live = any(w.live and w.running for w in list(_watches.values()))
+    if live and session.bottom_toolbar not in (None, _watch_toolbar):
+        return False  # the user's own toolbar: fall back to printing
+    if live and session.bottom_toolbar is None:
+        session.bottom_toolbar = _watch_toolbar
+    elif not live and session.bottom_toolbar is _watch_toolbar:
+        session.bottom_toolbar = None
+    app = session.app
+    if app.is_running:
+        app.invalidate()
+    return True
+
+def watch(expr, interval=1.0, budget=None, live=True, namespace=None):
+    """
+    Evaluate expr every interval seconds in the background.
+
+    Args:
+        expr: Expression string (evaluated in the caller's globals) or a callable
+        interval: Seconds between evaluations
+        budget: Seconds an evaluation may take; slower evaluations skip
+            the next tick (default: half the interval)
+        live: Show a sparkline/rate line (IPython toolbar, or above the
+            prompt when the value changes)
+
+    Returns:
+        The Watch; see watches() and unwatch()
+    """
+    if namespace is None and isinstance(expr, str):
+        namespace = sys._getframe(1).f_globals
+    wid = next(_watch_ids)
+    _watches[wid] = Watch(wid, expr, interval, namespace, budget, live)
+    if live:
+        _update_watch_toolbar()
+    return _watches[wid]
+
+def watches():
+    """List active watches."""
+    for wid, w in list(_watches.items()):
+        if not w.running:
+            del _watches[wid]
+            continue
+        print(w.render() + f"  every {w.interval:g}s")
+    if not _watches:
+        print("No active watches")
+
+def unwatch(wid=None):
+    """Cancel a watch by id, or all watches when wid is None."""
+    ids = list(_watches) if wid is None else [getattr(wid, 'id', wid)]
+    for i in ids:
+        w = _watches.pop(i, None)
+        if w is None:
+            print(f"No watch with id {i}")
+        else:
+            w.cancel()
+            print(f"Watch {i} cancelled")
+
+# asyncio mode: one persistent event loop on a background thread
+LOOP_LAG_INTERVAL = 0.25    # seconds between loop-lag probes
+LOOP_LAG_THRESHOLD = 0.1    # seconds of lag (or callback time) worth reporting
+
+class AsyncioLoopThread:
+    """
+    Run a single asyncio event loop forever on a daemon thread.
+
+    Coroutines are submitted with run(), so connection pools and sessions
+    created on the loop survive across REPL statements. A probe task
+    reports when the loop falls behind schedule. With slow_callbacks,
+    asyncio debug mode also names individual callbacks slower than
+    lag_threshold; it records a traceback for every task and handle, so
+    it is off unless asked for.
+    """
+
+    def __init__(self, lag_threshold=LOOP_LAG_THRESHOLD, slow_callbacks=False):
+        import asyncio
+        import threading
+
+        self.loop = asyncio.new_event_loop()
+        self.lag_threshold = lag_threshold
+        self.max_lag = 0.0
+        self.lag_events = 0
+        self._handler = None
+        if slow_callbacks:
+            self.set_debug(True)
+
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(ready,), name='asyncio-loop', daemon=True)
+        self._thread.start()
+        ready.wait()
+
+    @property
+    def running(self):
+        return self._thread.is_alive() and self.loop.is_running()
+
+    def _run(self, ready):
+        import asyncio
+
+        asyncio.set_event_loop(self.loop)
+        self.loop.call_soon(ready.set)
+        self.loop.create_task(self._monitor_lag())
+        try:
+            self.loop.run_forever()
+        finally:
+            tasks = asyncio.all_tasks(self.loop)
+            for task in tasks:
+                task.cancel()
+            self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+            self.loop.close()
+
+    async def _monitor_lag(self):
+        import asyncio
+
+        while True:
+            expected = self.loop.time() + LOOP_LAG_INTERVAL
+            await asyncio.sleep(LOOP_LAG_INTERVAL)
+            lag = self.loop.time() - expected
+            if lag > self.lag_threshold:
+                self.lag_events += 1
+                self.max_lag = max(self.max_lag, lag)
+                _print_above_prompt(f"⚠ asyncio loop blocked for {lag * 1000:.0f} ms")
+
+    def set_debug(self, enabled=True):
+        """Turn asyncio debug mode (slow-callback reports) on or off."""
+        import logging
+
+        class SlowCallbackHandler(logging.Handler):
+            def emit(self, record):
+                if str(record.msg).startswith('Executing'):
+                    _print_above_prompt(f"⚠ slow callback: {record.getMessage()}")
+
+        if enabled and self._handler is None:
+            self.loop.slow_callback_duration = self.lag_threshold
+            self._handler = SlowCallbackHandler(logging.WARNING)
+            logging.getLogger('asyncio').addHandler(self._handler)
+        elif not enabled and self._handler is not None:
+            logging.getLogger('asyncio').removeHandler(self._handler)
+            self._handler = None
+        if self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.set_debug, enabled)
+        else:
+            self.loop.set_debug(enabled)
+
+    def run(self, awaitable, timeout=None):
+        """Run an awaitable on the loop and wait for its result (Ctrl-C cancels it)."""
+        import asyncio
+        import concurrent.futures
+
+        if not asyncio.iscoroutine(awaitable):
+            async def _await(aw):
+                return await aw
+            awaitable = _await(awaitable)
+
+        future = asyncio.run_coroutine_threadsafe(awaitable, self.loop)
+        try:
+            return future.result(timeout)
+        except (KeyboardInterrupt, concurrent.futures.TimeoutError):
+            future.cancel()
+            raise
+
+    def stop(self, timeout=5.0):
+        """Cancel pending tasks, stop and close the loop."""
+        import logging
+
+        if self._handler is not None:
+            logging.getLogger('asyncio').removeHandler(self._handler)
+            self._handler = None
+        if self._thread.is_alive():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout)
+
+_asyncio_loop = None
+
+def asyncio_loop():
+    """
+    Return the persistent AsyncioLoopThread, starting it on first use.
+
+    Set PYTHONSTARTUP_ASYNCIO_DEBUG=1 (or call asyncio_loop().set_debug())
+    to report slow callbacks; debug mode slows task creation a lot.
+    """
+    global _asyncio_loop
+    import atexit
+
+    if _asyncio_loop is None or not _asyncio_loop.running:
+        debug = str(os.getenv('PYTHONSTARTUP_ASYNCIO_DEBUG', '0')).lower() in ('1', 'true', 'yes', 'on')
+        _asyncio_loop = AsyncioLoopThread(slow_callbacks=debug)
+        atexit.unregister(_stop_asyncio_loop)
+        atexit.register(_stop_asyncio_loop)
+    return _asyncio_loop
+
+def _stop_asyncio_loop():
+    global _asyncio_loop
+    if _asyncio_loop is not None:
+        _asyncio_loop.stop()
+        _asyncio_loop = None
+
+def aw(awaitable, timeout=None):
+    """Run a coroutine on the persistent event loop and return its result."""
+    return asyncio_loop().run(awaitable, timeout)
+
+def arepl(namespace=None):
+    """Start a nested REPL with top-level await on the persistent event loop."""
+    import ast
+    import code
+    import inspect
+    import types
+
+    runner = asyncio_loop()
+    if namespace is None:
+        namespace = sys._getframe(1).f_globals
+
+    class AsyncConsole(code.InteractiveConsole):
+        def __init__(self, local):
+            super().__init__(local)
+            self.compile.compiler.flags |= ast.PyCF_ALLOW_TOP_LEVEL_AWAIT
+
+        def runcode(self, code_obj):
+            try:
+                result = types.FunctionType(code_obj, self.locals)()
+                if inspect.iscoroutine(result):
+                    runner.run(result)
+            except SystemExit:
+                raise
+            except BaseException:
+                self.showtraceback()
+
+    AsyncConsole(namespace).interact(
+        banner="asyncio REPL: use 'await' directly, Ctrl-D to return", exitmsg=""
+    )
+
+def setup_asyncio_mode():
+    """
+    Start the persistent loop for aw() and arepl().
+
+    IPython's top-level await is left on IPython's own loop: handing its
+    runner to the loop thread would run whole cells off the main thread.
+    """
+    asyncio_loop()
+    return True
+
+# Idle-time prefetch (opt-in: `prefetch = yes` in the profile or PYTHONSTARTUP_PREFETCH=1)
+PREFETCH_START_DELAY = 0.5   # seconds after the first prompt before warming up
+PREFETCH_IDLE_POLL = 0.05    # seconds between "is the user busy?" checks
+PREFETCH_RECENT_FILES = 8    # recently viewed files primed per session
+PREFETCH_MIN_TRIES = 5       # sessions before an item's hit rate is trusted
+PREFETCH_MIN_HIT_RATE = 0.2  # items used less often than this are dropped
+
+class _PromptHook:
+    """sys.ps1 stand-in that calls back every time the main thread draws the prompt."""
+
+    def __init__(self, prompt, callback):
+        self.prompt = prompt
+        self.callback = callback
+
+    def __str__(self):
+        if threading.current_thread() is threading.main_thread():
+            self.callback()
+        return str(self.prompt)
+
+class PrefetchScheduler:
+    """
+    Warm up heavy modules and source caches while the shell is idle.
+
+    Work starts once the first prompt is shown and runs on a low-priority
+    daemon thread, one small task at a time, pausing whenever the user is
+    typing or running code. Which prefetched items actually get used is
+    recorded in the cache directory; items that keep going unused are
+    dropped from later sessions.
+    """
+
+    def __init__(self, is_ipython=False):
+        self.is_ipython = is_ipython
+        self.state_file = os.path.join(CACHE_DIR, 'prefetch.json')
+        self.state = self._load()
+        self.prefetched = set()
+        self.used = set()
+        self.busy = False
+        self._started = False
+        self._ip = None
+
+    # -- state ---------------------------------------------------------
+
+    def _load(self):
+        import json
+
+        try:
+            with open(self.state_file, encoding='utf-8') as f:
+                state = json.load(f)
+            if isinstance(state, dict):
+                state.setdefault('recent', [])
+                state.setdefault('stats', {})
+                return state
+        except (OSError, ValueError):
+            pass
+        return {'recent': [], 'stats': {}}
+
+    def save(self):
+        import json
+
+        stats = self.state['stats']
+        for key in self.prefetched:
+            tries, hits = stats.get(key, (0, 0))
+            stats[key] = (tries + 1, hits + (key in self.used))
+        self.prefetched.clear()
+        try:
+            os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+            tmp = f'{self.state_file}.{os.getpid()}.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(self.state, f)
+            os.replace(tmp, self.state_file)
+        except OSError:
+            pass
+
+    def note_use(self, *keys):
+        for key in keys:
+            if key in self.prefetched:
+                self.used.add(key)
+
+    def remember(self, path):
+        path = os.path.abspath(str(path))
+        recent = [p for p in self.state['recent'] if p != path]
+        recent.insert(0, path)
+        self.state['recent'] = recent[:PREFETCH_RECENT_FILES]
+
+    # -- tasks ---------------------------------------------------------
+
+    def tasks(self):
+        """Return [(key, callable)] to prefetch, best hit rate first."""
+        import importlib
+
+        def module(name):
+            return lambda: importlib.import_module(name)
+
+        def prime_lexer():
+            from pygments.lexers import PythonLexer
+            from pygments.styles import get_style_by_name
+            list(PythonLexer().get_tokens("def f(x):\n    return x\n"))
+            get_style_by_name('fruity')
+
+        def prime_file(path):
+            def prime():
+                import linecache
+                _read_source_text(path)
+                linecache.getlines(path)
+            return prime
+
+        tasks = []
+        if profile_enabled('rich'):
+            tasks += [('module:rich.console', module('rich.console')),
+                      ('module:rich.syntax', module('rich.syntax')),
+                      ('lexer:python', prime_lexer)]
+        if profile_enabled('pyread'):
+            tasks.append(('module:pyread', module('pyread')))
+        for path in self.state['recent']:
+            if os.path.isfile(path):
+                tasks.append((f'file:{path}', prime_file(path)))
+
+        def score(task):
+            tries, hits = self.state['stats'].get(task[0], (0, 0))
+            return hits / tries if tries else 1.0
+
+        def keep(task):
+            tries, _ = self.state['stats'].get(task[0], (0, 0))
+            return tries < PREFETCH_MIN_TRIES or score(task) >= PREFETCH_MIN_HIT_RATE
+
+        return sorted(filter(keep, tasks), key=score, reverse=True)
+
+    # -- scheduling ----------------------------------------------------
+
+    def install(self):
+        """Start after the first prompt and track when the user is busy."""
+        import atexit
+
+        atexit.register(self.save)
+        if self.is_ipython:
+            from IPython import get_ipython
+            self._ip = get_ipython()
+            self._ip.events.register('pre_run_cell', lambda *args: setattr(self, 'busy', True))
+            self._ip.events.register('post_run_cell', lambda *args: setattr(self, 'busy', False))
+            app = getattr(getattr(self._ip, 'pt_app', None), 'app', None)
+            if app is not None:
+                # run once, when prompt_toolkit draws the first prompt
+                app.pre_run_callables.append(self._on_prompt)
+            else:
+                self._start()  # no terminal prompt (e.g. a kernel)
+        else:
+            sys.ps1 = _PromptHook(getattr(sys, 'ps1', '>>> '), self._on_prompt)
+
+    def _on_prompt(self):
+        prompt = getattr(sys, 'ps1', None)
+        if isinstance(prompt, _PromptHook) and prompt.callback == self._on_prompt:
+            sys.ps1 = prompt.prompt
+        if not self._started:
+            self._start()
+
+    def _start(self):
+        import threading
+
+        self._started = True
+        threading.Thread(target=self._run, name='prefetch', daemon=True).start()
+
+    def user_busy(self):
+        if self.busy:
+            return True
+        try:
+            if self._ip is not None:
+                return bool(self._ip.pt_app.default_buffer.text)
+            # The plain REPL waits for input in C: a Python frame on the
+            # main thread means the user's code is running.
+            if threading.main_thread().ident in sys._current_frames():
+                return True
+            readline = sys.modules.get('readline')
+            return bool(readline and readline.get_line_buffer())
+        except Exception:
+            return False
+
+    def _run(self):
+        import threading
+        import time
+
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+        except (AttributeError, OSError):
+            pass
+
+        time.sleep(PREFETCH_START_DELAY)
+        for key, task in self.tasks():
+            while self.user_busy():
+                time.sleep(PREFETCH_IDLE_POLL)
+            try:
+                task()
+            except Exception:
+                continue
+            self.prefetched.add(key)
+            time.sleep(PREFETCH_IDLE_POLL)
+
+_prefetch = None
+
+def _prefetch_note_use(*keys):
+    if _prefetch is not None:
+        _prefetch.note_use(*keys)
+
+def _remember_view(path):
+    if _prefetch is not None and path:
+        _prefetch.remember(path)
+
+def setup_prefetch(is_ipython=False):
+    """Enable idle-time prefetching of heavy modules and recent files."""
+    global _prefetch
+
+    if _prefetch is None:
+        _prefetch = PrefetchScheduler(is_ipython)
+        _prefetch.install()
+    return _prefetch
+
+def kill(pid, sig=None):
+    """Kill a process by PID with specified signal."""
+    import signal
+    return kill_process(pid, sig or signal.SIGTERM)
+
+# Regular function versions
+def read(path: str) -> Optional[str]:
+    """Read and display a file or module with syntax highlighting."""
+    return read_module_or_file(path)
+
+def source(*args, **kwargs):
+    """Alias for get_source()"""
+    return get_source(*args, **kwargs)
+
+def src(*args, **kwargs):
+    """Alias for get_source()"""
+    return get_source(*args, **kwargs)
+
+# Setup shell functions for standard Python
+def setup_shell_functions():
+    """Setup shell-like functions for standard Python interpreter."""
+    import builtins
+    
+    def ls(path=None):
+        """List directory contents."""
+        if path is None:
+            path = os.getcwd()
+        try:
+            return os.listdir(path)
+        except OSError as e:
+            print(f"Error: {e}")
+            return []
+    
+    def cd(path = None):
+        print(f"path: {path}")
+        """Change directory."""
+        try:
+            os.chdir(path or pwd())
+            print(f"Changed to: {os.getcwd()}")
+        except OSError as e:
+            print(f"Error: {e}")
+    
+    def mkdir(path):
+        """Create directory."""
+        try:
+            os.makedirs(path, exist_ok=True)
+            print(f"Created directory: {path}")
+        except OSError as e:
+            print(f"Error: {e}")
+    
+    def cls():
+        """Clear screen."""
+        if sys.platform == 'win32':
+            os.system('cls')  # type: ignore
+        else:
+            os.system('clear')
+
+    def pwd():
+        """Print working directory."""
+        cwd = os.getcwd()
+        print(cwd)
+        return cwd
+    
+    # Add functions to builtins so they're available globally
+    # builtins.ls = ls
+    builtins.cd = cd  # type: ignore
+    # builtins.mkdir = mkdir
+    builtins.cls = cls  # type: ignore
+    builtins.pwd = pwd  # type: ignore
+
+# IPython Magic Commands Setup
+def setup_ipython_magic():
+    """Setup IPython magic commands for easy usage."""
+    try:
+        from IPython import get_ipython
+        from IPython.core.magic import Magics, line_magic, magics_class
+        from IPython.core.magic_arguments import magic_arguments, parse_argstring, argument
+        
+        ip = get_ipython()
+        if ip is None:
+            return False
+        
+        @magics_class
+        class CodeToolsMagics(Magics):
+            
+            @line_magic
+            def read(self, line):
+                """Magic command to read files without quotes.
+                
+                Usage: %read filename.py
+                       %read module.submodule
+                """
+                if not line.strip():
+                    print("Usage: %read filename.py or %read module.name")
+                    return
+                
+                return read_module_or_file(line.strip())
+            
+            @line_magic
+            def src(self, line):
+                """Magic command to show source code.
+                
+                Usage: %src function_name
+                       %src ClassName
+                """
+                if not line.strip():
+                    print("Usage: %src function_name")
+                    return
+                
+                # Try to get the object from the user namespace
+                try:
+                    obj = ip.user_ns.get(line.strip())
+                    if obj is None:
+                        # Try to evaluate it
+                        obj = eval(line.strip(), ip.user_ns)
+                    
+                    if obj is not None:
+                        get_source(obj)
+                    else:
+                        print(f"Object '{line.strip()}' not found")
+                except Exception as e:
+                    print(f"Error: {e}")
+            
+            @line_magic
+            def source(self, line):
+                """Alias for %src"""
+                return self.src(line)
+            
+            @line_magic
+            def peek(self, line):
+                """Preview a CSV/TSV, JSONL or Parquet file without loading it.
+                
+                Usage: %peek data.csv
+                       %peek data.jsonl tail 20
+                       %peek data.parquet schema
+                """
+                import shlex
+                args = shlex.split(line)
+                if not args:
+                    print("Usage: %peek file [head|tail|sample|schema] [n]")
+                    return
+                
+                n, mode = 10, 'head'
+                for arg in args[1:]:
+                    if arg.isdigit():
+                        n = int(arg)
+                    else:
+                        mode = arg
+                return peek(args[0], n, mode)
+            
+            @line_magic
+            def tail(self, line):
+                """Show the last lines of a file, optionally following it.
+                
+                Usage: %tail app.log
+                       %tail app.log -n 50 -f
+                       %tail app.log -f --grep "ERROR|FATAL"
+                """
+                import shlex
+                usage = "Usage: %tail file [-n N] [-f] [--grep REGEX]"
+                try:
+                    args = shlex.split(line)
+                    path, n, follow, grep = None, 100, False, None
+                    it = iter(args)
+                    for arg in it:
+                        if arg in ('-f', '--follow'):
+                            follow = True
+                        elif arg in ('-n', '--lines'):
+                            n = int(next(it, n))
+                        elif arg in ('-g', '--grep'):
+                            grep = next(it, None)
+                        elif arg.isdigit() and path is not None:
+                            n = int(arg)
+                        else:
+                            path = arg
+                except ValueError:
+                    path = None
+                if path is None:
+                    print(usage)
+                    return
+                return tail(path, n, follow, grep)
+            
+            @line_magic
+            def watch(self, line):
+                """Evaluate an expression periodically in the background.
+                
+                Usage: %watch                        # list watches
+                       %watch len(queue)
+                       %watch -n 5 os.path.getsize("app.log")
+                """
+                line = line.strip()
+                if not line:
+                    return watches()
+                
+                interval = 1.0
+                if line.startswith('-n'):
+                    try:
+                        _, interval, line = line.split(None, 2)
+                        interval = float(interval)
+                        if interval <= 0:
+                            raise ValueError(interval)
+                    except ValueError:
+                        print("Usage: %watch [-n SECONDS] expression")
+                        return
+                try:
+                    return watch(line, interval, namespace=ip.user_ns)
+                except SyntaxError as e:
+                    print(f"Error: {e}")
+            
+            @line_magic
+            def unwatch(self, line):
+                """Cancel a watch.
+                
+                Usage: %unwatch 1
+                       %unwatch            # cancel all
+                """
+                try:
+                    wid = int(line) if line.strip() else None
+                except ValueError:
+                    print("Usage: %unwatch [id]")
+                    return
+                return unwatch(wid)
+            
+            @line_magic
+            def lls(self, line):
+                """List directory contents.
+                
+                Usage: %ls
+                       %ls /path/to/dir
+                """
+                path = line.strip() if line.strip() else None
+                if path is None:
+                    path = os.getcwd()
+                try:
+                    files = os.listdir(path)
+                    for f in files:
+                        print(f)
+                    return files
+                except OSError as e:
+                    print(f"Error: {e}")
+                    return []
+            
+            @line_magic
+            def cd(self, line):
+                """Change directory.
+                
+                Usage: %cd /path/to/directory
+                """
+                if not line.strip():
+                    print("Usage: %cd /path/to/directory")
+                    return
+                
+                try:
+                    os.chdir(line.strip())
+                    print(f"Changed to: {os.getcwd()}")
+                except OSError as e:
+                    print(f"Error: {e}")
+            
+            @line_magic
+            def pwd(self, line):
+                """Print working directory."""
+                cwd = os.getcwd()
+                print(cwd)
+                return cwd
+            
+            @line_magic
+            def nkdir(self, line):
+                """Create directory.
+                
+                Usage: %mkdir directory_name
+                """
+                if not line.strip():
+                    print("Usage: %mkdir directory_name")
+                    return
+                
+                try:
+                    os.makedirs(line.strip(), exist_ok=True)
+                    # import clipboard
+                    # clipboard.copy(os.path.realpath(line))
+                    print(f"Created directory: {line.strip()}")
+                except OSError as e:
+                    print(f"Error: {e}")
+            
+            @line_magic
+            def cls(self, line):
+                """Clear screen."""
+                if sys.platform == 'win32':
+                    os.system('cls')  # type: ignore
+                else:
+                    os.system('clear')
+
+            @line_magic
+            def kill(self, line, sig=None):
+                """Kill a process by PID with specified signal."""
+                import signal
+                return kill_process(int(line), sig or signal.SIGTERM)
+
+            @line_magic
+            def x(self, line):
+                exit()
+
+        
+        # Register the magic commands
+        # ip.register_magic_function(CodeToolsMagics.read, 'line', 'read')
+        # ip.register_magic_function(CodeToolsMagics.src, 'line', 'src')
+        # ip.register_magic_function(CodeToolsMagics.source, 'line', 'source')
+        # ip.register_magic_function(CodeToolsMagics.ls, 'line', 'ls')
+        # ip.register_magic_function(CodeToolsMagics.cd, 'line', 'cd')
+        # ip.register_magic_function(CodeToolsMagics.pwd, 'line', 'pwd')
+        # ip.register_magic_function(CodeToolsMagics.mkdir, 'line', 'mkdir')
+        # ip.register_magic_function(CodeToolsMagics.cls, 'line', 'cls')
+        # ip.register_magic_function(CodeToolsMagics.kill, 'line', 'kill')
+        ip.register_magics(CodeToolsMagics(ip))
+        return True
+        
+    except ImportError:
+        return False
+
+def detect_environment(verbose=True):
+    """Detect if running in IPython or standard Python."""
+    say = print if verbose else (lambda *args, **kwargs: None)
+    # IPython is always imported before it runs startup files, so there is
+    # no need to pay for importing it in a plain interpreter.
+    if 'IPython' not in sys.modules:
+        say("Running in standard Python interpreter")
+        return False
+    try:
+        from IPython import get_ipython
+        if get_ipython() is not None:
+            say("Running in IPython environment")
+            return True
+        else:
+            say("Running in standard Python interpreter")
+            return False
+    except ImportError:
+        say("Running in standard Python interpreter")
+        return False
+
+# Initialize the environment
+def initialize():
+    """Initialize the environment based on the Python interpreter."""
+    global logger
+    say = print if profile_enabled('banner') else (lambda *args, **kwargs: None)
+    say("Python Environment Tool Initialized")
+    say("=" * 50)
+    
+    # rich_setup()
+    # pyread_setup()
+
+    if PROFILE_NAME != 'default':
+        say(f"Startup profile: {PROFILE_NAME}")
+
+    if PROFILE.get('logging', 'none') != 'none':
+        logger = Logger(PROFILE['logging'])
+
+    if os.getenv('TRACEBACK_DEBUGGER_SERVER'):
+        install_traceback_reporter()
+
+    # Detect environment
+    is_ipython = detect_environment(profile_enabled('banner'))
+    
+    if is_ipython:
+        # Setup IPython magic commands
+        if profile_enabled('magics'):
+            if setup_ipython_magic():
+                say("✅ IPython magic commands registered!")
+                say("\nAvailable magic commands:")
+                say("  %read test3.py        # Read file without quotes")
+                say("  %src function_name    # Show source code")
+                say("  %source class_name    # Show source code")
+                say("  %peek data.csv tail   # Preview CSV/JSONL/Parquet")
+                say("  %tail app.log -f      # Tail/follow a log file")
+                say("  %watch -n 5 expr      # Watch an expression")
+                say("  %ls                   # List directory")
+                say("  %cd /path             # Change directory")
+                say("  %pwd                  # Print working directory")
+                say("  %mkdir dirname        # Create directory")
+                say("  %cls                  # Clear screen")
+                say("  %kill pid             # kill by pid")
+                say("\nYou can now use: %read test3.py")
+            else:
+                say("❌ Failed to setup IPython magic commands")
+    elif profile_enabled('builtins'):
+        # Setup regular functions for standard Python
+        setup_shell_functions()
+        say("✅ Shell functions available globally")
+    
+    if profile_enabled('asyncio') or str(os.getenv('PYTHONSTARTUP_ASYNCIO', '0')).lower() in ('1', 'true', 'yes', 'on'):
+        if setup_asyncio_mode():
+            if is_ipython:
+                say("✅ asyncio mode: aw(coro) runs on a persistent loop")
+            else:
+                say("✅ asyncio mode: aw(coro) runs on a persistent loop, arepl() for top-level await")
+
+    # print(f"\nRich syntax highlighting: {'Available' if rich_available() else 'Not available'}")
+    # print(f"Code analysis: {'Available' if pyread_available() else 'Not available'}")
+    if profile_enabled('prefetch') or str(os.getenv('PYTHONSTARTUP_PREFETCH', '0')).lower() in ('1', 'true', 'yes', 'on'):
+        setup_prefetch(is_ipython)
+
+    if profile_enabled('banner'):
+        say(f"Terminal width: {get_terminal_width()}")